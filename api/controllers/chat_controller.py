@@ -1,12 +1,19 @@
-from flask import request, jsonify
-from services.claude_service import ClaudeService
+import json
+from itertools import chain
+from flask import request, jsonify, Response, stream_with_context
+from utils.concurrency import UpstreamBusyError
+from utils.startup import lazy_service
+
+def _create_claude_service(controller):
+    # anthropic 클라이언트 로드는 첫 요청 때 수행
+    from services.claude_service import ClaudeService
+    return ClaudeService()
 
 class ChatController:
     """채팅 관련 요청을 처리하는 컨트롤러 클래스"""
     
-    def __init__(self):
-        """컨트롤러 초기화"""
-        self.claude_service = ClaudeService()
+    # 서비스는 첫 사용 시 생성 (워커 시작 시간 단축)
+    claude_service = lazy_service(_create_claude_service)
     
     def process_message(self):
         """
@@ -24,9 +31,24 @@ class ChatController:
             
             user_message = data['message']
             conversation_history = data.get('conversation_history', [])
+            conversation_id = data.get('conversation_id')  # 선택 사항 (요약 캐시 구분용)
+            
+            # 스트리밍 모드: 응답 텍스트를 Server-Sent Events로 생성되는 대로 전송
+            if data.get('stream'):
+                # 첫 이벤트까지 미리 받아 혼잡(UpstreamBusyError)이면 스트림 대신 503으로 응답
+                events = self._stream_events(user_message, conversation_history, conversation_id)
+                first_event = next(events)
+                return Response(
+                    stream_with_context(chain([first_event], events)),
+                    mimetype='text/event-stream',
+                    headers={
+                        'Cache-Control': 'no-cache',
+                        'X-Accel-Buffering': 'no'  # 프록시 버퍼링 방지
+                    }
+                )
             
             # Claude API 호출
-            response = self.claude_service.get_response(user_message, conversation_history)
+            response = self.claude_service.get_response(user_message, conversation_history, conversation_id)
             
             # 응답 반환
             return jsonify({
@@ -34,6 +56,30 @@ class ChatController:
                 "status": "success"
             })
             
+        except UpstreamBusyError:
+            return jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}), 503
         except Exception as e:
             print(f"메시지 처리 오류: {str(e)}")
-            return jsonify({"error": "메시지 처리 중 오류가 발생했습니다."}), 500
\ No newline at end of file
+            return jsonify({"error": "메시지 처리 중 오류가 발생했습니다."}), 500
+    
+    def _stream_events(self, user_message, conversation_history, conversation_id=None):
+        """
+        Claude 응답 조각을 SSE 이벤트 형식으로 변환
+        
+        Yields:
+            str: 'delta' 이벤트 (텍스트 조각)와 마지막 'done' 이벤트 (전체 응답)
+        """
+        full_response = []
+        for delta in self.claude_service.stream_response(user_message, conversation_history, conversation_id):
+            full_response.append(delta)
+            yield self._format_event('delta', {"delta": delta})
+        
+        yield self._format_event('done', {
+            "response": ''.join(full_response),
+            "status": "success"
+        })
+    
+    @staticmethod
+    def _format_event(event, data):
+        """SSE 이벤트 문자열 생성"""
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,173 @@
+from flask import Response, jsonify, request
+from config import Config
+from models import get_db_pool_stats
+from services.tts_cache import get_tts_cache
+from services.transcode_service import get_transcode_service
+from services.user_service import get_user_cache_stats
+from services.voice_model_service import get_model_cache_stats
+from utils.concurrency import get_bulkhead, get_bulkhead_stats
+from utils.http_client import get_pool_stats
+from utils.tracing import get_exporter_stats
+from utils.metrics import registry, CONTENT_TYPE
+from utils.startup import is_loaded, startup_profiler
+
+# 항상 현황에 표시할 업스트림 (아직 호출되지 않았어도 포함)
+UPSTREAMS = ('claude', 'fish_tts', 'google_stt')
+
+class MetricsController:
+    """서버 내부 상태(업스트림 격벽, 연결 풀, 캐시 등)를 조회하는 컨트롤러 클래스"""
+    
+    def __init__(self, voice_controller=None, chat_controller=None, tts_controller=None):
+        """
+        컨트롤러 초기화
+        
+        Args:
+            voice_controller (VoiceController, optional): 스트리밍 세션 현황 조회용
+            chat_controller (ChatController, optional): Claude 토큰 사용량 조회용
+            tts_controller (TTSController, optional): 음성 모델 목록 캐시 현황 조회용
+        """
+        self.voice_controller = voice_controller
+        self.chat_controller = chat_controller
+        self.tts_controller = tts_controller
+        
+        # 현황 값은 요청 처리 중이 아니라 메트릭 조회 시에만 계산
+        registry.register_collector(self._collect)
+    
+    def get_metrics(self):
+        """
+        서버 메트릭 조회 (기본은 Prometheus 텍스트 형식, ?format=json이면 JSON 현황)
+        
+        Returns:
+            Response: 텍스트 또는 JSON 응답
+        """
+        if request.args.get('format') == 'json':
+            return self.get_status()
+        
+        try:
+            return Response(registry.render(), content_type=CONTENT_TYPE)
+        except Exception as e:
+            print(f"메트릭 조회 오류: {str(e)}")
+            return jsonify({"error": "서버 상태 조회 중 오류가 발생했습니다."}), 500
+    
+    def get_status(self):
+        """
+        서버 내부 상태 조회
+        
+        Returns:
+            Response: JSON 응답
+        """
+        try:
+            return jsonify(self._build_status())
+        except Exception as e:
+            print(f"메트릭 조회 오류: {str(e)}")
+            return jsonify({"error": "서버 상태 조회 중 오류가 발생했습니다."}), 500
+    
+    def _build_status(self):
+        """서버 내부 상태를 dict로 수집"""
+        for name in UPSTREAMS:
+            get_bulkhead(name)
+        
+        metrics = {
+            "upstreams": get_bulkhead_stats(),
+            "http_pools": get_pool_stats(),
+            "transcode": get_transcode_service().stats(),
+            "db_pool": get_db_pool_stats(),
+            "user_cache": get_user_cache_stats(),
+            "voice_model_cache": get_model_cache_stats()
+        }
+        
+        if Config.TTS_CACHE_ENABLED:
+            metrics["tts_cache"] = get_tts_cache().stats()
+        
+        # 아직 사용되지 않은 서비스는 메트릭 조회 때문에 생성하지 않음
+        if self.tts_controller and is_loaded(self.tts_controller, 'voice_catalog'):
+            metrics["voice_catalog"] = self.tts_controller.voice_catalog.stats()
+        
+        claude_usage = {}
+        if self.chat_controller and is_loaded(self.chat_controller, 'claude_service'):
+            claude_usage["chat"] = self.chat_controller.claude_service.get_usage_stats()
+        if self.voice_controller:
+            if is_loaded(self.voice_controller, 'claude_service'):
+                claude_usage["voice"] = self.voice_controller.claude_service.get_usage_stats()
+            metrics["stream_sessions"] = self.voice_controller.audio_buffer.stats()
+        metrics["claude_usage"] = claude_usage
+        if Config.TRACING_ENABLED:
+            metrics["tracing"] = get_exporter_stats()
+        metrics["startup"] = startup_profiler.report()
+        
+        return metrics
+    
+    def _collect(self):
+        """
+        현황 값을 Prometheus 게이지/카운터로 변환 (registry 수집 함수)
+        
+        Returns:
+            list: (이름, 형식, 설명, [(레이블 dict, 값)]) 튜플 리스트
+        """
+        status = self._build_status()
+        upstreams = status["upstreams"]
+        db_pool = status["db_pool"] or {}
+        transcode = status["transcode"]
+        
+        # 캐시별 (적중, 미스) 수
+        cache_counts = {
+            "user_profile": (status["user_cache"]["hits"], status["user_cache"]["misses"]),
+            "voice_model_registry": (status["voice_model_cache"]["hits"], status["voice_model_cache"]["misses"])
+        }
+        if "tts_cache" in status:
+            tts = status["tts_cache"]
+            cache_counts["tts_audio"] = (tts["memory_hits"] + tts["disk_hits"], tts["misses"])
+        if "voice_catalog" in status:
+            catalog = status["voice_catalog"]
+            cache_counts["voice_catalog"] = (catalog["hits"] + catalog["stale_hits"],
+                                             catalog["refreshes"] + catalog["refresh_failures"])
+        
+        families = [
+            ("upstream_in_flight", "gauge", "업스트림별 진행 중인 요청 수",
+             [({"upstream": name}, stats["in_flight"]) for name, stats in upstreams.items()]),
+            ("upstream_queued", "gauge", "업스트림별 자리 대기 중인 요청 수",
+             [({"upstream": name}, stats["queued"]) for name, stats in upstreams.items()]),
+            ("upstream_rejected_total", "counter", "업스트림별 거절된 요청 수",
+             [({"upstream": name, "reason": "full"}, stats["rejected_full"]) for name, stats in upstreams.items()]
+             + [({"upstream": name, "reason": "circuit_open"}, stats["rejected_open"]) for name, stats in upstreams.items()]),
+            ("upstream_circuit_open", "gauge", "업스트림 회로 차단기가 열려 있으면 1",
+             [({"upstream": name}, 0 if stats["circuit"]["state"] == "closed" else 1) for name, stats in upstreams.items()]),
+            ("transcode_in_flight", "gauge", "진행 중인 ffmpeg 변환 작업 수",
+             [({}, transcode["in_flight"])]),
+            ("transcode_jobs_total", "counter", "ffmpeg 변환 작업 수",
+             [({"result": "completed"}, transcode["completed_jobs"]),
+              ({"result": "failed"}, transcode["failed_jobs"]),
+              ({"result": "rejected"}, transcode["rejected_jobs"])]),
+            ("db_pool_checked_out", "gauge", "사용 중인 DB 연결 수",
+             [({}, db_pool.get("checked_out"))]),
+            ("db_pool_waiting", "gauge", "DB 연결을 기다리는 요청 수",
+             [({}, db_pool.get("waiting"))]),
+            ("db_pool_saturation", "gauge", "DB 연결 풀 사용률 (0~1)",
+             [({}, db_pool.get("saturation"))]),
+            ("db_pool_timeouts_total", "counter", "DB 연결 대기 시간 초과 수",
+             [({}, db_pool.get("timeouts"))]),
+            ("cache_hits_total", "counter", "캐시 적중 수",
+             [({"cache": name}, hits) for name, (hits, _) in cache_counts.items()]),
+            ("cache_misses_total", "counter", "캐시 미스 수",
+             [({"cache": name}, misses) for name, (_, misses) in cache_counts.items()]),
+            ("cache_hit_ratio", "gauge", "캐시 적중률 (0~1)",
+             [({"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+              for name, (hits, misses) in cache_counts.items()])
+        ]
+        
+        if "stream_sessions" in status:
+            families.append(("stream_buffer_bytes", "gauge", "스트리밍 세션 오디오 버퍼 크기 합계",
+                             [({}, status["stream_sessions"]["total_bytes"])]))
+        
+        token_samples = []
+        for source, usage in status["claude_usage"].items():
+            for kind in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+                token_samples.append(({"source": source, "kind": kind}, usage[kind]))
+        families.append(("claude_tokens_total", "counter", "Claude 토큰 사용량", token_samples))
+        
+        if "tracing" in status:
+            families.append(("trace_spans_total", "counter", "추적 span 기록 수",
+                             [({"result": "exported"}, status["tracing"]["exported"]),
+                              ({"result": "dropped"}, status["tracing"]["dropped"])]))
+        
+        return families
@@ -1,17 +1,28 @@
-from flask import request, jsonify, send_file
+from flask import request, jsonify, send_file, Response
+import hashlib
+import io
+import json
 import os
-import tempfile
+import re
+import uuid
+from werkzeug.datastructures import FileStorage
 from services.tts_service import FishTTSService
-from services.voice_model_service import VoiceModelService
+from services.transcode_service import get_transcode_service, TranscodeQueueFullError
+from services.voice_model_service import VoiceModelService, LISTABLE_STATUSES
+from services.voice_catalog import get_voice_catalog, CatalogUnavailableError
+from config import Config
 from models.voice_model import VoiceModel
+from utils.concurrency import UpstreamBusyError
+from utils.startup import lazy_service
 
 class TTSController:
     """TTS 관련 요청을 처리하는 컨트롤러 클래스"""
     
-    def __init__(self):
-        """컨트롤러 초기화"""
-        self.tts_service = FishTTSService()
-        self.voice_model_service = VoiceModelService(self.tts_service)
+    # 서비스는 첫 사용 시 생성 (워커 시작 시간 단축)
+    tts_service = lazy_service(lambda controller: FishTTSService())
+    voice_model_service = lazy_service(lambda controller: VoiceModelService(controller.tts_service))
+    transcode_service = lazy_service(lambda controller: get_transcode_service())
+    voice_catalog = lazy_service(lambda controller: get_voice_catalog(controller.tts_service.list_voice_models))
     
     def create_voice_model(self):
         """
@@ -37,32 +48,74 @@ class TTSController:
             if not user_id or not model_name:
                 return jsonify({"error": "사용자 ID와 모델명이 필요합니다."}), 400
             
-            # 음성 모델 생성
-            # 임시 구현: 실제로는 voice_model_service의 create_voice_model 호출
-            # result = self.voice_model_service.create_voice_model(
-            #     user_id=int(user_id),
-            #     model_name=model_name,
-            #     audio_file=audio_file,
-            #     description=description
-            # )
+            try:
+                user_id = int(user_id)
+            except ValueError:
+                return jsonify({"error": "잘못된 사용자 ID입니다."}), 400
             
-            # 임시 구현 (DB 연동 없이 Fish TTS API만 호출)
-            result = self.tts_service.create_voice_model(user_id, audio_file)
+            # WAV가 아닌 업로드는 프로세스 풀에서 WAV로 변환
+            audio_file = self._ensure_wav(audio_file, request.form.get('format'))
+            if audio_file is None:
+                return jsonify({"error": "오디오 형식을 변환할 수 없습니다."}), 400
+            
+            # 음성 모델 생성 작업 등록 (Fish TTS 모델 생성은 백그라운드에서 진행)
+            result = self.voice_model_service.create_voice_model(
+                user_id=user_id,
+                model_name=model_name,
+                audio_file=audio_file,
+                description=description
+            )
             
             # 오류 확인
             if isinstance(result, dict) and 'error' in result:
                 return jsonify(result), 400
             
-            # 성공 응답
-            return jsonify({
-                "message": "음성 모델이 성공적으로 생성되었습니다.",
-                "model": result
-            }), 201
+            # 작업 접수 응답 (job_id로 진행 상태 조회)
+            response = jsonify({
+                "message": "음성 모델 생성 작업이 접수되었습니다.",
+                "job_id": result.id,
+                "status": result.status,
+                "status_url": f"/api/voice-model/jobs/{result.id}"
+            })
+            response.headers['Location'] = f"/api/voice-model/jobs/{result.id}"
+            return response, 202
             
+        except TranscodeQueueFullError:
+            response = jsonify({"error": "요청이 많아 오디오를 처리할 수 없습니다. 잠시 후 다시 시도해주세요."})
+            response.headers['Retry-After'] = '1'
+            return response, 429
         except Exception as e:
             print(f"음성 모델 생성 오류: {str(e)}")
             return jsonify({"error": "음성 모델 생성 중 오류가 발생했습니다."}), 500
     
+    def get_voice_model_job(self, job_id):
+        """
+        음성 모델 생성 작업 상태 조회
+        
+        Args:
+            job_id (int): 작업 ID (음성 모델 ID)
+            
+        Returns:
+            Response: JSON 응답 (status: processing, active, failed)
+        """
+        try:
+            model = self.voice_model_service.get_model_by_id(job_id)
+            if not model:
+                return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+            
+            response = jsonify({
+                "job_id": model.id,
+                "status": model.status,
+                "model": model.to_dict() if model.status == 'active' else None
+            })
+            if model.status == 'processing':
+                response.headers['Retry-After'] = '2'
+            return response
+            
+        except Exception as e:
+            print(f"음성 모델 작업 조회 오류: {str(e)}")
+            return jsonify({"error": "작업 상태 조회 중 오류가 발생했습니다."}), 500
+    
     def text_to_speech(self):
         """
         텍스트를 음성으로 변환 (커스텀 음성 모델 사용 가능)
@@ -80,51 +133,277 @@ class TTSController:
             text = data['text']
             reference_id = data.get('reference_id')  # 선택 사항
             
+            # 스트리밍 모드: 생성되는 오디오를 청크 단위로 바로 전송
+            # (pipeline 모드는 문장 단위로 병렬 합성 후 순서대로 전송)
+            if data.get('pipeline') or data.get('stream'):
+                if data.get('pipeline'):
+                    audio_stream = self.tts_service.text_to_speech_pipeline(text, reference_id)
+                else:
+                    audio_stream = self.tts_service.stream_text_to_speech(text, reference_id)
+                
+                if audio_stream is None:
+                    return jsonify({"error": "음성 생성에 실패했습니다."}), 500
+                
+                # Content-Length 없이 반환하면 chunked 전송 인코딩으로 전달됨
+                return Response(
+                    audio_stream,
+                    mimetype='audio/mpeg',
+                    headers={
+                        'Content-Disposition': 'attachment; filename=speech.mp3',
+                        'X-Accel-Buffering': 'no'  # 프록시 버퍼링 방지
+                    }
+                )
+            
             # TTS 변환 수행
             audio_data = self.tts_service.text_to_speech(text, reference_id)
             
             if not audio_data:
                 return jsonify({"error": "음성 생성에 실패했습니다."}), 500
             
-            # 임시 파일에 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
-            
-            # 오디오 파일 응답
+            # 오디오 파일 응답 (임시 파일 없이 메모리에서 전송)
             return send_file(
-                temp_path,
+                io.BytesIO(audio_data),
                 mimetype='audio/mpeg',
                 as_attachment=True,
-                download_name='speech.mp3',
-                # 파일 전송 후 삭제
-                attachment_filename='speech.mp3'  # 구 버전 Flask 호환용
+                download_name='speech.mp3'
             )
             
+        except UpstreamBusyError:
+            return jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}), 503
         except Exception as e:
             print(f"TTS 변환 오류: {str(e)}")
             return jsonify({"error": "텍스트 음성 변환 중 오류가 발생했습니다."}), 500
     
+    def text_to_speech_batch(self):
+        """
+        여러 텍스트를 한 번에 음성으로 변환
+        
+        요청 본문:
+            items (list): {"text": str, "reference_id": str(선택)} 리스트
+            response (str, optional): 'multipart'(기본값, 완료 순서대로 오디오 스트리밍)
+                                      또는 'keys'(캐시 키만 즉시 반환, 오디오는 나중에 조회)
+        
+        Returns:
+            Response: multipart/mixed 스트림 또는 JSON 응답
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            items = data.get('items')
+            
+            # 필수 필드 검증
+            if not isinstance(items, list) or not items:
+                return jsonify({"error": "변환할 항목 목록이 필요합니다."}), 400
+            
+            if len(items) > Config.TTS_BATCH_MAX_ITEMS:
+                return jsonify({"error": f"한 번에 최대 {Config.TTS_BATCH_MAX_ITEMS}개까지 변환할 수 있습니다."}), 400
+            
+            for item in items:
+                if not isinstance(item, dict) or not isinstance(item.get('text'), str) or not item['text'].strip():
+                    return jsonify({"error": "모든 항목에 변환할 텍스트가 필요합니다."}), 400
+                if item.get('reference_id') is not None and not isinstance(item['reference_id'], str):
+                    return jsonify({"error": "reference_id는 문자열이어야 합니다."}), 400
+            
+            response_mode = data.get('response', 'multipart')
+            if response_mode not in ('multipart', 'keys'):
+                return jsonify({"error": "response는 'multipart' 또는 'keys'여야 합니다."}), 400
+            
+            if response_mode == 'keys' and not self.tts_service.cache:
+                return jsonify({"error": "캐시가 비활성화되어 있어 keys 모드를 사용할 수 없습니다."}), 400
+            
+            # keys 모드: 합성은 백그라운드에서 계속하고 캐시 키만 반환
+            if response_mode == 'keys':
+                keys, _ = self.tts_service.text_to_speech_batch(items, background=True)
+                return jsonify({
+                    "items": [{"index": index, "key": key} for index, key in enumerate(keys)]
+                }), 202
+            
+            # multipart 모드: 합성이 끝난 항목부터 파트 하나씩 전송
+            keys, results = self.tts_service.text_to_speech_batch(items)
+            boundary = uuid.uuid4().hex
+            response = Response(
+                self._multipart_parts(keys, results, boundary),
+                mimetype=f'multipart/mixed; boundary={boundary}',
+                headers={'X-Accel-Buffering': 'no'}  # 프록시 버퍼링 방지
+            )
+            # 본문 전송 전에 연결이 끊겨도 구독한 합성 작업을 정리
+            response.call_on_close(results.close)
+            return response
+            
+        except UpstreamBusyError:
+            return jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}), 503
+        except Exception as e:
+            print(f"일괄 TTS 변환 오류: {str(e)}")
+            return jsonify({"error": "일괄 음성 변환 중 오류가 발생했습니다."}), 500
+    
+    def get_batch_audio(self, cache_key):
+        """
+        일괄 변환(keys 모드)으로 생성된 오디오 조회
+        
+        Args:
+            cache_key (str): 일괄 변환 응답의 캐시 키
+            
+        Returns:
+            Response: 오디오 파일 또는 JSON 응답 (합성 중이면 202)
+        """
+        try:
+            # 캐시 키는 SHA-256 16진수 문자열 (디스크 경로에 사용되므로 형식 검증)
+            if not re.fullmatch(r'[0-9a-f]{64}', cache_key):
+                return jsonify({"error": "잘못된 캐시 키입니다."}), 400
+            
+            status, audio_data = self.tts_service.get_batch_result(cache_key)
+            
+            if status == 'processing':
+                response = jsonify({"status": "processing"})
+                response.headers['Retry-After'] = '1'
+                return response, 202
+            
+            if status == 'missing':
+                return jsonify({"error": "해당 오디오를 찾을 수 없습니다."}), 404
+            
+            return send_file(
+                io.BytesIO(audio_data),
+                mimetype='audio/mpeg',
+                download_name=f'{cache_key}.mp3'
+            )
+            
+        except Exception as e:
+            print(f"일괄 변환 결과 조회 오류: {str(e)}")
+            return jsonify({"error": "오디오 조회 중 오류가 발생했습니다."}), 500
+    
     def list_voice_models(self):
         """
         사용자의 음성 모델 목록 조회
         
+        쿼리 파라미터:
+            user_id (int, optional): 사용자 ID (없으면 Fish TTS 전체 모델 목록)
+            status (str, optional): 모델 상태 (기본값 'active')
+            page (int, optional): 페이지 번호 (기본값 1)
+            per_page (int, optional): 페이지당 항목 수
+            cursor (str, optional): 전체 목록 조회 시 이전 응답의 next_cursor
+            limit (int, optional): 전체 목록 조회 시 페이지당 항목 수
+        
         Returns:
             Response: JSON 응답
         """
         try:
             # 사용자 ID 가져오기 (선택 사항)
-            user_id = request.args.get('user_id')
+            user_id = request.args.get('user_id', type=int)
             
-            # 음성 모델 목록 조회
-            # 임시 구현: 직접 서비스 호출
-            models = self.tts_service.list_voice_models(user_id)
+            if user_id is None:
+                return self._list_catalog()
+            
+            status = request.args.get('status', 'active')
+            if status not in LISTABLE_STATUSES:
+                return jsonify({"error": "잘못된 모델 상태입니다."}), 400
+            
+            # 사용자별 모델 목록 (DB + 목록 캐시)
+            result = self.voice_model_service.list_voice_models(
+                user_id,
+                status=status,
+                page=request.args.get('page', 1, type=int),
+                per_page=request.args.get('per_page', type=int)
+            )
             
             # 성공 응답
-            return jsonify({
-                "models": models
-            })
+            return jsonify(result)
             
+        except UpstreamBusyError:
+            return jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}), 503
         except Exception as e:
             print(f"모델 목록 조회 오류: {str(e)}")
-            return jsonify({"error": "음성 모델 목록 조회 중 오류가 발생했습니다."}), 500
\ No newline at end of file
+            return jsonify({"error": "음성 모델 목록 조회 중 오류가 발생했습니다."}), 500
+    
+    def _list_catalog(self):
+        """
+        Fish TTS 전체 음성 모델 목록을 커서 단위로 조회 (캐시 사용, If-None-Match 일치 시 304)
+        
+        Returns:
+            Response: JSON 응답
+        """
+        try:
+            page = self.voice_catalog.get_page(
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit', type=int)
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except CatalogUnavailableError:
+            return jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}), 503
+        
+        response = jsonify({
+            "models": page['models'],
+            "next_cursor": page['next_cursor'],
+            "total": page['total']
+        })
+        
+        # 목록 버전과 페이지 위치가 같으면 같은 ETag → 폴링 클라이언트는 304로 본문 생략
+        raw = f"{page['etag']}:{request.args.get('cursor', '')}:{request.args.get('limit', '')}"
+        response.set_etag(hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32])
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
+    def _ensure_wav(self, audio_file, input_format=None):
+        """
+        업로드된 음성 파일을 WAV 형식으로 변환 (이미 WAV면 그대로 반환)
+        
+        Args:
+            audio_file (FileStorage): 업로드된 파일
+            input_format (str, optional): 입력 형식 (없으면 파일 확장자로 판단)
+            
+        Returns:
+            FileStorage: WAV 파일, 변환 실패 시 None
+            
+        Raises:
+            TranscodeQueueFullError: 변환 대기열이 가득 찬 경우
+        """
+        if not input_format:
+            input_format = os.path.splitext(audio_file.filename)[1].lstrip('.').lower() or 'wav'
+        
+        if input_format == 'wav':
+            return audio_file
+        
+        try:
+            wav_data = self.transcode_service.convert(audio_file.read(), input_format, 'wav')
+        except TranscodeQueueFullError:
+            raise
+        except Exception as e:
+            print(f"음성 파일 변환 오류: {str(e)}")
+            return None
+        
+        base_name = os.path.splitext(audio_file.filename)[0]
+        return FileStorage(
+            stream=io.BytesIO(wav_data),
+            filename=f"{base_name}.wav",
+            content_type='audio/wav'
+        )
+    
+    def _multipart_parts(self, keys, results, boundary):
+        """
+        일괄 변환 결과를 완료 순서대로 multipart/mixed 파트로 변환
+        
+        같은 내용의 항목은 파트 하나로 보내고 X-Item-Indices 헤더에 해당 항목 번호를 모두 표시
+        """
+        indices = {}
+        for index, key in enumerate(keys):
+            indices.setdefault(key, []).append(str(index))
+        
+        try:
+            for key, audio_data in results:
+                if audio_data:
+                    content_type, body = 'audio/mpeg', audio_data
+                else:
+                    content_type = 'application/json'
+                    body = json.dumps({"error": "음성 생성에 실패했습니다."}, ensure_ascii=False).encode('utf-8')
+                
+                headers = (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"X-Cache-Key: {key}\r\n"
+                    f"X-Item-Indices: {','.join(indices[key])}\r\n\r\n"
+                )
+                yield headers.encode('ascii') + body + b"\r\n"
+            
+            yield f"--{boundary}--\r\n".encode('ascii')
+        finally:
+            results.close()
@@ -1,12 +1,13 @@
 from flask import request, jsonify
 from services.user_service import UserService
+from utils.password_hasher import PasswordHasherBusyError
+from utils.startup import lazy_service
 
 class UserController:
     """사용자 관련 요청을 처리하는 컨트롤러 클래스"""
     
-    def __init__(self):
-        """컨트롤러 초기화"""
-        self.user_service = UserService()
+    # 서비스는 첫 사용 시 생성 (워커 시작 시간 단축)
+    user_service = lazy_service(lambda controller: UserService())
     
     def register(self):
         """
@@ -41,6 +42,10 @@ class UserController:
                 "user": result.to_dict()
             }), 201
             
+        except PasswordHasherBusyError:
+            response = jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."})
+            response.headers['Retry-After'] = '1'
+            return response, 503
         except Exception as e:
             print(f"사용자 등록 오류: {str(e)}")
             return jsonify({"error": "사용자 등록 중 오류가 발생했습니다."}), 500
@@ -78,6 +83,10 @@ class UserController:
                 # "token": token  # JWT 사용 시 주석 해제
             })
             
+        except PasswordHasherBusyError:
+            response = jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."})
+            response.headers['Retry-After'] = '1'
+            return response, 503
         except Exception as e:
             print(f"로그인 오류: {str(e)}")
             return jsonify({"error": "로그인 중 오류가 발생했습니다."}), 500
@@ -93,12 +102,12 @@ class UserController:
             Response: JSON 응답
         """
         try:
-            user = self.user_service.get_user_by_id(user_id)
+            profile = self.user_service.get_user_profile(user_id)
             
-            if not user:
+            if not profile:
                 return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
             
-            return jsonify({"user": user.to_dict()})
+            return jsonify({"user": profile})
             
         except Exception as e:
             print(f"프로필 조회 오류: {str(e)}")
@@ -129,6 +138,10 @@ class UserController:
                 "user": result.to_dict()
             })
             
+        except PasswordHasherBusyError:
+            response = jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."})
+            response.headers['Retry-After'] = '1'
+            return response, 503
         except Exception as e:
             print(f"프로필 업데이트 오류: {str(e)}")
             return jsonify({"error": "프로필 업데이트 중 오류가 발생했습니다."}), 500
@@ -1,17 +1,49 @@
+from collections import deque
 from flask import request, jsonify
 from flask_socketio import emit
-from services.speech_service import SpeechService
-from services.claude_service import ClaudeService
+from services.transcode_service import TranscodeQueueFullError
+from services.session_buffer import SessionBufferStore
+from utils.concurrency import UpstreamBusyError
+from utils.startup import lazy_service
+from utils.text_utils import pop_complete_sentences
+
+# 기본 스트리밍 오디오 형식 (16kHz, 16비트 모노 PCM, 클라이언트가 sample_rate로 변경 가능)
+STREAM_SAMPLE_RATE = 16000
+STREAM_SAMPLE_WIDTH = 2
+# 클라이언트가 지정할 수 있는 샘플링 레이트 (Hz)
+STREAM_SAMPLE_RATES = (8000, 16000, 22050, 44100, 48000)
+
+def _create_speech_service(controller):
+    # speech_recognition 로드는 첫 요청 때 수행
+    from services.speech_service import SpeechService
+    return SpeechService()
+
+def _create_claude_service(controller):
+    from services.claude_service import ClaudeService
+    return ClaudeService()
+
+def _create_tts_service(controller):
+    from services.tts_service import FishTTSService
+    return FishTTSService()
 
 class VoiceController:
     """음성 관련 요청을 처리하는 컨트롤러 클래스"""
     
-    def __init__(self):
-        """컨트롤러 초기화"""
-        self.speech_service = SpeechService()
-        self.claude_service = ClaudeService()
-        # 실시간 스트리밍을 위한 버퍼
-        self.audio_buffer = {}  # 사용자 ID를 키로 사용
+    # 서비스는 첫 사용 시 생성 (워커 시작 시간 단축)
+    speech_service = lazy_service(_create_speech_service)
+    claude_service = lazy_service(_create_claude_service)
+    tts_service = lazy_service(_create_tts_service)
+    
+    def __init__(self, socketio=None):
+        """
+        컨트롤러 초기화
+        
+        Args:
+            socketio: 백그라운드 응답 전송에 사용할 SocketIO 인스턴스 (선택사항)
+        """
+        self.socketio = socketio
+        # 실시간 스트리밍을 위한 세션별 발화 분할기 (용량/유휴 시간 제한)
+        self.audio_buffer = SessionBufferStore()  # 소켓 세션 ID를 키로 사용
     
     def speech_to_text(self):
         """
@@ -33,11 +65,12 @@ class VoiceController:
             # 오디오 데이터 읽기
             audio_data = audio_file.read()
             
-            # 필요한 경우 오디오 형식 변환
+            # 필요한 경우 오디오 디코딩 (WAV 재인코딩/임시 파일 없이 PCM으로 변환)
             input_format = request.form.get('format', 'webm')
             if input_format != 'wav':
-                audio_data = self.speech_service.convert_audio_format(
-                    audio_data, input_format, 'wav')
+                audio_data = self.speech_service.decode_audio(audio_data, input_format)
+                if audio_data is None:
+                    return jsonify({"error": "오디오 형식을 변환할 수 없습니다."}), 400
             
             # 음성 인식 수행
             text = self.speech_service.speech_to_text(audio_data, language)
@@ -48,5 +81,156 @@ class VoiceController:
                 "status": "success"
             })
             
+        except TranscodeQueueFullError:
+            response = jsonify({"error": "요청이 많아 오디오를 처리할 수 없습니다. 잠시 후 다시 시도해주세요."})
+            response.headers['Retry-After'] = '1'
+            return response, 429
+        except UpstreamBusyError:
+            return jsonify({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}), 503
+        except Exception as e:
+            print(f"음성 인식 오류: {str(e)}")
+            return jsonify({"error": "음성 인식 중 오류가 발생했습니다."}), 500
+    
+    def process_stream(self, payload):
+        """
+        실시간 스트리밍 오디오 청크 처리 (Socket.IO 'stream_audio' 이벤트)
+        
+        발화가 끝나면 음성 인식 -> Claude 응답 스트리밍 -> 문장 단위 TTS 순으로
+        파이프라인을 실행하고 결과를 소켓으로 전송
+        
+        Args:
+            payload (bytes | dict): PCM 오디오 청크 또는
+                {"audio": bytes, "final": bool, "language": str, "reference_id": str}
+        """
+        try:
+            if isinstance(payload, dict):
+                audio_chunk = payload.get('audio') or b''
+                is_final = bool(payload.get('final'))
+                language = payload.get('language', 'ko-KR')
+                reference_id = payload.get('reference_id')
+                try:
+                    sample_rate = int(payload.get('sample_rate') or STREAM_SAMPLE_RATE)
+                except (TypeError, ValueError):
+                    sample_rate = None
+                # 잘못된 값은 분할기를 만들기 전에 거부 (음수/0에 가까운 값은 프레임 크기가 0 이하가 됨)
+                if sample_rate not in STREAM_SAMPLE_RATES:
+                    emit('stream_error', {"error": f"지원하지 않는 샘플링 레이트입니다. ({', '.join(map(str, STREAM_SAMPLE_RATES))})"})
+                    return
+            else:
+                audio_chunk = payload or b''
+                is_final = False
+                language = 'ko-KR'
+                reference_id = None
+                sample_rate = STREAM_SAMPLE_RATE
+            
+            session_id = request.sid
+            utterances = self._append_audio(session_id, audio_chunk, is_final, sample_rate)
+            if not utterances:
+                return
+            
+            # 발화 단위 처리는 백그라운드에서 수행 (이벤트 핸들러는 바로 반환)
+            if self.socketio:
+                self.socketio.start_background_task(
+                    self._respond_to_utterances, session_id, utterances, language, reference_id, sample_rate)
+            else:
+                self._respond_to_utterances(session_id, utterances, language, reference_id, sample_rate)
+            
+        except Exception as e:
+            print(f"스트리밍 오디오 처리 오류: {str(e)}")
+            emit('stream_error', {"error": "스트리밍 오디오 처리 중 오류가 발생했습니다."})
+    
+    def _append_audio(self, session_id, audio_chunk, is_final, sample_rate):
+        """
+        세션의 발화 분할기에 오디오를 추가하고 완성된 발화 목록을 반환
+        
+        음성 구간 검출로 무음은 버리고, 음성 이후 pause_threshold 이상 무음이 이어지거나
+        클라이언트가 final 플래그를 보내면 발화를 완성
+        """
+        with self.audio_buffer.lock:
+            segmenter = self.audio_buffer.get(session_id)
+            if segmenter is None or segmenter.sample_rate != sample_rate:
+                segmenter = self.speech_service.create_segmenter(
+                    sample_rate, STREAM_SAMPLE_WIDTH, self.audio_buffer.session_max_bytes)
+                self.audio_buffer.put(session_id, segmenter)
+            
+            utterances = segmenter.feed(audio_chunk)
+            
+            if is_final:
+                last_utterance = segmenter.flush()
+                if last_utterance:
+                    utterances.append(last_utterance)
+            
+            # 전체 메모리 상한 초과 시 오래된 세션의 버퍼를 비움
+            shed_sessions = self.audio_buffer.enforce_limits()
+        
+        for shed_session_id in shed_sessions:
+            self._emit('stream_reset', {"error": "서버 메모리 부족으로 녹음 중인 오디오가 삭제되었습니다."}, shed_session_id)
+        
+        return utterances
+    
+    def end_session(self, session_id):
+        """
+        스트리밍 세션 종료 (연결 해제 시 버퍼 해제)
+        
+        Args:
+            session_id (str): 소켓 세션 ID
+        """
+        self.audio_buffer.remove(session_id)
+    
+    def _respond_to_utterances(self, session_id, utterances, language, reference_id, sample_rate):
+        """완성된 발화들을 순서대로 처리"""
+        for utterance in utterances:
+            self._respond_to_utterance(session_id, utterance, language, reference_id, sample_rate)
+    
+    def _respond_to_utterance(self, session_id, utterance, language, reference_id, sample_rate=STREAM_SAMPLE_RATE):
+        """발화 하나에 대해 음성 인식 -> Claude 스트리밍 -> TTS 파이프라인 실행"""
+        try:
+            # 1. 음성 인식
+            text = self.speech_service.process_stream_chunk(
+                utterance, language, sample_rate, STREAM_SAMPLE_WIDTH)
+            if not text:
+                return
+            self._emit('transcript', {"text": text}, session_id)
+            
+            # 2. Claude 응답을 스트리밍으로 받으면서 완성된 문장부터 TTS 작업 제출
+            pending = deque()
+            text_buffer = ''
+            full_response = []
+            
+            for delta in self.claude_service.stream_response(text):
+                full_response.append(delta)
+                self._emit('response_text', {"delta": delta}, session_id)
+                
+                text_buffer += delta
+                sentences, text_buffer = pop_complete_sentences(text_buffer)
+                for sentence in sentences:
+                    pending.append(self.tts_service.submit_sentence(sentence, reference_id))
+                
+                # 3. 앞 문장의 음성이 준비되는 대로 순서대로 전송
+                self._emit_ready_audio(pending, session_id)
+            
+            if text_buffer.strip():
+                pending.append(self.tts_service.submit_sentence(text_buffer.strip(), reference_id))
+            
+            self._emit_ready_audio(pending, session_id, wait=True)
+            self._emit('response_end', {"text": ''.join(full_response)}, session_id)
+            
+        except UpstreamBusyError:
+            self._emit('stream_error', {"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", "status": 503}, session_id)
         except Exception as e:
-            print(f"음성 인식 오류: {str(e)}")
\ No newline at end of file
+            print(f"음성 대화 파이프라인 오류: {str(e)}")
+            self._emit('stream_error', {"error": "음성 응답 생성 중 오류가 발생했습니다."}, session_id)
+    
+    def _emit_ready_audio(self, pending, session_id, wait=False):
+        """완료된 맨 앞 TTS 작업부터 순서대로 오디오 전송 (wait=True면 모두 완료될 때까지 대기)"""
+        while pending and (wait or pending[0].done()):
+            audio_data = pending.popleft().result()
+            if audio_data:
+                self._emit('audio_chunk', {"audio": audio_data}, session_id)
+    
+    def _emit(self, event, data, session_id):
+        """특정 소켓 세션에 이벤트 전송"""
+        if self.socketio:
+            self.socketio.emit(event, data, to=session_id)
+        else:
+            emit(event, data)
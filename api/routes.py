@@ -1,17 +1,21 @@
-from flask import jsonify
+from flask import jsonify, request
 from api.controllers.chat_controller import ChatController
 from api.controllers.voice_controller import VoiceController
 from api.controllers.tts_controller import TTSController
 from api.controllers.user_controller import UserController
+from api.controllers.metrics_controller import MetricsController
+from utils import tracing
+from utils.metrics import socketio_sessions, socketio_events, socketio_event_duration, socketio_received_bytes
 
 def register_routes(app, socketio):
     """앱에 모든 API 라우트 등록"""
     
     # 컨트롤러 인스턴스 생성
     chat_controller = ChatController()
-    voice_controller = VoiceController()
+    voice_controller = VoiceController(socketio)
     tts_controller = TTSController()
     user_controller = UserController()
+    metrics_controller = MetricsController(voice_controller, chat_controller, tts_controller)
     
     # REST API 엔드포인트 정의
     
@@ -35,11 +39,24 @@ def register_routes(app, socketio):
     def create_voice_model():
         return tts_controller.create_voice_model()
     
+    @app.route('/api/voice-model/jobs/<int:job_id>', methods=['GET'])
+    def get_voice_model_job(job_id):
+        return tts_controller.get_voice_model_job(job_id)
+    
     # 5. 텍스트 -> 음성 변환 엔드포인트 (with custom voice)
     @app.route('/api/text-to-speech', methods=['POST'])
     def text_to_speech():
         return tts_controller.text_to_speech()
     
+    # 5-1. 여러 텍스트 일괄 변환 (완료 순서대로 multipart 스트리밍 또는 캐시 키 반환)
+    @app.route('/api/text-to-speech/batch', methods=['POST'])
+    def text_to_speech_batch():
+        return tts_controller.text_to_speech_batch()
+    
+    @app.route('/api/text-to-speech/batch/<string:cache_key>', methods=['GET'])
+    def get_batch_audio(cache_key):
+        return tts_controller.get_batch_audio(cache_key)
+    
     # 6. 음성 모델 목록 조회
     @app.route('/api/voice-models', methods=['GET'])
     def list_voice_models():
@@ -66,7 +83,12 @@ def register_routes(app, socketio):
     def delete_user(user_id):
         return user_controller.delete_account(user_id)
     
-    # 8. 오류 핸들러
+    # 8. 서버 상태 조회 (업스트림 격벽/회로 차단기, 연결 풀, 캐시 등)
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics():
+        return metrics_controller.get_metrics()
+    
+    # 9. 오류 핸들러
     @app.errorhandler(404)
     def not_found(e):
         return jsonify({"error": "요청한 리소스를 찾을 수 없습니다."}), 404
@@ -79,11 +101,21 @@ def register_routes(app, socketio):
     @socketio.on('connect')
     def handle_connect():
         print('클라이언트 연결됨')
+        socketio_sessions.inc()
+        socketio_events.inc(event='connect')
     
     @socketio.on('disconnect')
     def handle_disconnect():
         print('클라이언트 연결 해제됨')
+        socketio_sessions.dec()
+        socketio_events.inc(event='disconnect')
+        voice_controller.end_session(request.sid)
     
     @socketio.on('stream_audio')
     def handle_stream_audio(audio_data):
-        voice_controller.process_stream(audio_data)
\ No newline at end of file
+        socketio_events.inc(event='stream_audio')
+        chunk = audio_data.get('audio') if isinstance(audio_data, dict) else audio_data
+        if isinstance(chunk, (bytes, bytearray)):
+            socketio_received_bytes.inc(len(chunk), event='stream_audio')
+        with socketio_event_duration.time(event='stream_audio'), tracing.trace('socketio.stream_audio'):
+            voice_controller.process_stream(audio_data)
\ No newline at end of file
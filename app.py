@@ -1,26 +1,120 @@
+import os
+import time
+
+# 시작 시간 측정 기준점 (인터프리터 시작 이후 app 모듈 로드 시점)
+_started = time.perf_counter()
+
+# python app.py로 실행하면 오디오 변환 프로세스 풀(forkserver)의 작업 프로세스가 메인 모듈을
+# __mp_main__으로 다시 불러옴 → 패치/앱 생성/워커 초기화를 모두 건너뜀
+_is_pool_process = __name__ == '__mp_main__'
+
+# 비동기 워커 모드에서는 다른 모듈을 불러오기 전에 표준 라이브러리를 패치해야 함
+# (소켓/스레드/time.sleep 등이 그린 스레드로 동작하여 외부 API 대기 중에도 워커가 막히지 않음)
+# .env 로드 전이므로 ASYNC_MODE는 실행 환경 변수에서 읽음
+_async_mode = None if _is_pool_process else os.getenv('ASYNC_MODE')
+if _async_mode == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif _async_mode == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
 from flask import Flask
 from flask_cors import CORS
 from flask_socketio import SocketIO
 from config import Config
-from models import init_db
+from models import init_db, init_worker_db
+from utils.startup import startup_profiler
+from utils import metrics, tracing
+
+startup_profiler.record('imports', time.perf_counter() - _started)
+
+def create_app():
+    """
+    Flask 앱과 SocketIO 인스턴스 생성 (DB 설정, 라우트 등록 포함)
+    
+    Returns:
+        tuple: (Flask 앱, SocketIO 인스턴스)
+    """
+    # 앱 인스턴스 생성
+    with startup_profiler.timed('flask_app'):
+        app = Flask(__name__)
+        Config.init_app(app)
+    
+        # CORS 설정 (Flutter 앱에서 접근 허용)
+        CORS(app)
+    
+        # 라우트별 요청 수/처리 시간/전송량 측정
+        metrics.init_app(app)
+    
+        # 요청별 단계 추적 (TRACING_ENABLED일 때만)
+        tracing.init_app(app)
+    
+    # SocketIO 설정 (실시간 음성 스트리밍)
+    with startup_profiler.timed('socketio'):
+        socketio = SocketIO(app, cors_allowed_origins="*", async_mode=Config.ASYNC_MODE)
+    
+    # 데이터베이스 초기화 (연결은 워커에서 엶)
+    with startup_profiler.timed('init_db'):
+        init_db(app, Config)
+    
+    # 라우트 등록 (컨트롤러의 서비스는 첫 요청 시 생성)
+    with startup_profiler.timed('register_routes'):
+        from api.routes import register_routes
+        register_routes(app, socketio)
+    
+    return app, socketio
+
+def preload_shared_state():
+    """
+    gunicorn에서 불러올 때 무거운 모듈을 미리 불러옴 (preload_app 사용 시 마스터에서 실행)
+    
+    fork 후 워커들은 불러온 모듈을 copy-on-write로 공유하므로 워커마다 다시 import하지 않음
+    연결/스레드/작업 풀은 fork 후 워커별로 만들어야 하므로 여기서 생성하지 않음
+    """
+    with startup_profiler.timed('preload_modules'):
+        import services.claude_service  # noqa: F401 (anthropic SDK)
+        import services.speech_service  # noqa: F401 (speech_recognition, pydub)
+
+_initialized_pid = None
 
-# 앱 인스턴스 생성
-app = Flask(__name__)
-Config.init_app(app)
+def init_worker():
+    """
+    워커 프로세스별 초기화 (gunicorn에서는 post_worker_init 훅에서, 그 외에는 앱 로드 시 호출)
+    
+    DB 연결 풀을 준비하고 서버 재시작 등으로 중단된 음성 모델 생성 작업을 재실행
+    (스키마 생성/변경과 예전 JSON 목록 이전은 배포 시 python -m migrations로 실행)
+    같은 프로세스에서 두 번 호출되면 두 번째 호출은 무시
+    """
+    global _initialized_pid
+    if _initialized_pid == os.getpid():
+        return
+    _initialized_pid = os.getpid()
 
-# CORS 설정 (Flutter 앱에서 접근 허용)
-CORS(app)
+    with startup_profiler.timed('db_pool_warmup'):
+        init_worker_db(app, Config)
 
-# SocketIO 설정 (실시간 음성 스트리밍)
-socketio = SocketIO(app, cors_allowed_origins="*")
+    with startup_profiler.timed('resume_jobs'):
+        from services.tts_service import FishTTSService
+        from services.voice_model_service import VoiceModelService
+        voice_model_service = VoiceModelService(FishTTSService())
+        with app.app_context():
+            voice_model_service.resume_stalled_jobs()
+        # 이후에도 작업 상태를 주기적으로 갱신하고 다른 워커에서 중단된 작업을 다시 찾음
+        voice_model_service.start_job_monitor(app)
 
-# 데이터베이스 초기화
-init_db(app, Config)
+    startup_profiler.print_report(f"워커 시작 시간 (pid {os.getpid()})")
 
-# 라우트 등록
-from api.routes import register_routes
-register_routes(app, socketio)
+# gunicorn.conf.py로 실행하면 워커 초기화는 항상 post_worker_init 훅에서 실행
+# (--preload 명령행 옵션으로 마스터에서 불러와도 마스터에서는 초기화하지 않음)
+# python app.py 등 그 외 실행 방식에서는 여기서 초기화
+if not _is_pool_process:
+    app, socketio = create_app()
+    if os.getenv('GUNICORN_MANAGED') == 'true':
+        preload_shared_state()
+    else:
+        init_worker()
 
 if __name__ == '__main__':
-    print(f"서버 시작! 포트: {Config.PORT}")
-    socketio.run(app, host='0.0.0.0', port=Config.PORT, debug=Config.DEBUG)
\ No newline at end of file
+    print(f"서버 시작! 포트: {Config.PORT}, 비동기 모드: {socketio.async_mode}")
+    socketio.run(app, host='0.0.0.0', port=Config.PORT, debug=Config.DEBUG)
@@ -0,0 +1,140 @@
+"""
+로그인 처리량 벤치마크
+
+요청 스레드에서 직접 비밀번호를 검증하던 방식(inline)과 전용 작업 풀에서 검증하는 방식(pool)의
+초당 로그인 수(코어당)와, 로그인 부하 중 가벼운 요청(/api/health)의 지연 시간을 비교
+
+사용 예:
+    python -m benchmarks.login_throughput --clients 16 --duration 10
+    ASYNC_MODE=eventlet python -m benchmarks.login_throughput --mode pool
+"""
+import os
+
+# 비동기 워커 환경을 재현하려면 다른 모듈을 불러오기 전에 패치해야 함 (app.py와 동일)
+if os.getenv('ASYNC_MODE') == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif os.getenv('ASYNC_MODE') == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from flask import Flask, jsonify
+from werkzeug.security import check_password_hash
+from config import Config
+from models import db
+from models.user import User
+from models.voice_model import VoiceModel  # noqa: F401 (User.voice_models 관계 매핑용)
+from api.controllers.user_controller import UserController
+
+USERNAME = 'bench_user'
+PASSWORD = 'bench-password-1234'
+
+def create_app(db_path):
+    """SQLite 임시 DB를 사용하는 로그인/건강 체크 전용 앱 생성"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{db_path}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    user_controller = UserController()
+
+    @app.route('/api/auth/login', methods=['POST'])
+    def login():
+        return user_controller.login()
+
+    @app.route('/api/health', methods=['GET'])
+    def health_check():
+        return jsonify({"status": "ok"})
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username=USERNAME, email=f'{USERNAME}@example.com', password=PASSWORD))
+        db.session.commit()
+
+    return app
+
+def run_clients(app, clients, duration):
+    """여러 클라이언트 스레드에서 로그인을 반복하고 동시에 건강 체크 지연 시간을 측정"""
+    stop_at = time.perf_counter() + duration
+    counts = [0] * clients
+    errors = [0] * clients
+    health_latencies = []
+
+    def login_worker(index):
+        client = app.test_client()
+        while time.perf_counter() < stop_at:
+            response = client.post('/api/auth/login', json={
+                'username_or_email': USERNAME,
+                'password': PASSWORD
+            })
+            if response.status_code == 200:
+                counts[index] += 1
+            else:
+                errors[index] += 1
+
+    def health_worker():
+        client = app.test_client()
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            client.get('/api/health')
+            health_latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=login_worker, args=(i,)) for i in range(clients)]
+    threads.append(threading.Thread(target=health_worker))
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return sum(counts), sum(errors), elapsed, health_latencies
+
+def run_benchmark(app, args, cores):
+    """모드별로 로그인 처리량과 건강 체크 지연 시간 측정"""
+    pool_check_password = User.check_password
+
+    def inline_check_password(self, password):
+        return check_password_hash(self.password_hash, password)
+
+    modes = ('inline', 'pool') if args.mode == 'both' else (args.mode,)
+    print(f"비동기 모드: {Config.ASYNC_MODE or 'threading'}, 코어 수: {cores}, "
+          f"PBKDF2 반복 횟수: {Config.PASSWORD_HASH_ITERATIONS}, 클라이언트: {args.clients}")
+
+    for mode in modes:
+        User.check_password = inline_check_password if mode == 'inline' else pool_check_password
+        logins, errors, elapsed, latencies = run_clients(app, args.clients, args.duration)
+
+        rate = logins / elapsed
+        p50 = statistics.median(latencies) if latencies else 0.0
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) >= 20 else max(latencies or [0.0])
+        print(f"[{mode:6}] 로그인 {rate:8.1f}/초 (코어당 {rate / cores:6.1f}/초), 오류 {errors}, "
+              f"health 지연 p50 {p50:6.1f}ms / p95 {p95:6.1f}ms")
+
+    User.check_password = pool_check_password
+
+def main():
+    parser = argparse.ArgumentParser(description='로그인 처리량 벤치마크')
+    parser.add_argument('--mode', choices=('inline', 'pool', 'both'), default='both',
+                        help='inline: 요청 스레드에서 검증(변경 전), pool: 작업 풀에서 검증(변경 후)')
+    parser.add_argument('--clients', type=int, default=16, help='동시 로그인 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=10, help='모드별 측정 시간 (초)')
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        run_benchmark(create_app(db_path), args, cores)
+    finally:
+        os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -18,11 +18,109 @@ class Config:
     # 경로 설정
     VOICE_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'voice_models')
     
+    # TTS 오디오 캐시 설정
+    TTS_CACHE_ENABLED = os.getenv('TTS_CACHE_ENABLED', 'true').lower() == 'true'
+    TTS_CACHE_DIR = os.path.join(VOICE_MODELS_DIR, 'tts_cache')
+    TTS_CACHE_MEMORY_MAX_BYTES = int(os.getenv('TTS_CACHE_MEMORY_MAX_BYTES', 64 * 1024 * 1024))  # 메모리 캐시 용량
+    TTS_CACHE_DISK_MAX_BYTES = int(os.getenv('TTS_CACHE_DISK_MAX_BYTES', 1024 * 1024 * 1024))  # 디스크 캐시 용량
+    TTS_CACHE_TTL = int(os.getenv('TTS_CACHE_TTL', 7 * 24 * 3600))  # 캐시 유효 시간 (초)
+    
+    # TTS 스트리밍 설정
+    TTS_STREAM_CHUNK_SIZE = int(os.getenv('TTS_STREAM_CHUNK_SIZE', 8192))  # 클라이언트로 전달할 청크 크기 (바이트)
+    TTS_STREAM_CACHE_MAX_BYTES = int(os.getenv('TTS_STREAM_CACHE_MAX_BYTES', 4 * 1024 * 1024))  # 스트리밍 중 캐시에 보관할 최대 크기
+    
+    # 문장 단위 TTS 파이프라인 설정
+    TTS_PIPELINE_WORKERS = int(os.getenv('TTS_PIPELINE_WORKERS', 4))  # 동시 합성 작업 수
+    TTS_PIPELINE_MAX_CHARS = int(os.getenv('TTS_PIPELINE_MAX_CHARS', 200))  # 문장 하나의 최대 길이
+    TTS_PIPELINE_RETRIES = int(os.getenv('TTS_PIPELINE_RETRIES', 2))  # 문장별 재시도 횟수
+    TTS_PIPELINE_RETRY_BACKOFF = float(os.getenv('TTS_PIPELINE_RETRY_BACKOFF', 0.5))  # 재시도 대기 시간 (초, 지수 증가)
+    
+    # 음성 모델 생성 작업 설정 (백그라운드 작업 풀)
+    VOICE_MODEL_JOB_WORKERS = int(os.getenv('VOICE_MODEL_JOB_WORKERS', 2))  # 동시 모델 생성 작업 수
+    VOICE_MODEL_JOB_RETRIES = int(os.getenv('VOICE_MODEL_JOB_RETRIES', 3))  # 업스트림 혼잡 시 재시도 횟수
+    VOICE_MODEL_JOB_RETRY_BACKOFF = float(os.getenv('VOICE_MODEL_JOB_RETRY_BACKOFF', 2))  # 재시도 대기 시간 (초, 지수 증가)
+    VOICE_MODEL_JOB_STALE_AFTER = int(os.getenv('VOICE_MODEL_JOB_STALE_AFTER', 600))  # 이 시간(초) 이상 갱신되지 않은 작업은 다른 워커가 재실행
+    VOICE_MODEL_JOB_HEARTBEAT = int(os.getenv('VOICE_MODEL_JOB_HEARTBEAT', 60))  # 대기/실행 중인 작업의 updated_at 갱신 주기 (초, STALE_AFTER보다 짧게)
+    VOICE_MODEL_JOB_RESCAN_INTERVAL = int(os.getenv('VOICE_MODEL_JOB_RESCAN_INTERVAL', 300))  # 중단된 작업을 다시 찾는 주기 (초)
+    
+    # 음성 모델 목록 조회 설정
+    VOICE_MODEL_CACHE_SIZE = int(os.getenv('VOICE_MODEL_CACHE_SIZE', 10000))  # 캐시할 (사용자, 상태) 목록 수
+    VOICE_MODEL_CACHE_TTL = int(os.getenv('VOICE_MODEL_CACHE_TTL', 60))  # 목록 캐시 유효 시간 (초, 다른 워커 프로세스의 변경 반영 주기)
+    VOICE_MODEL_PAGE_SIZE = int(os.getenv('VOICE_MODEL_PAGE_SIZE', 20))  # 기본 페이지 크기
+    VOICE_MODEL_MAX_PAGE_SIZE = int(os.getenv('VOICE_MODEL_MAX_PAGE_SIZE', 100))  # 최대 페이지 크기
+    
+    # Fish TTS 전체 음성 모델 목록 캐시 설정
+    VOICE_CATALOG_TTL = int(os.getenv('VOICE_CATALOG_TTL', 300))  # 목록을 새것으로 보는 시간 (초)
+    VOICE_CATALOG_STALE_TTL = int(os.getenv('VOICE_CATALOG_STALE_TTL', 3600))  # 만료 후 백그라운드 갱신 중 이전 목록을 제공할 최대 시간 (초)
+    
+    # 비밀번호 해시 설정 (반복 횟수를 바꾸면 기존 사용자는 다음 로그인 때 새 설정으로 다시 해시됨)
+    PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 600000))  # PBKDF2-SHA256 반복 횟수
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))  # 동시 해시 계산 스레드 수
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', 64))  # 최대 대기 작업 수 (초과 시 503)
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))  # 작업 하나의 최대 대기 시간 (초)
+    
+    # 사용자 정보 캐시 설정 (프로필 조회용)
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))  # 캐시할 최대 사용자 수
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))  # 캐시 유효 시간 (초, 다른 워커 프로세스의 변경 반영 주기)
+    
+    # 요청 추적(span) 설정 - 요청별 단계 소요 시간을 JSON Lines(Zipkin v2 형식)로 기록
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 1.0))  # 추적할 요청 비율 (0~1, traceparent의 sampled 플래그가 켜져 있으면 항상 추적, 꺼져 있으면 추적 안 함, X-Trace-Id는 비율을 따름)
+    TRACE_EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'traces.jsonl'))
+    TRACE_EXPORT_QUEUE = int(os.getenv('TRACE_EXPORT_QUEUE', 10000))  # 기록 대기 span 수 (초과 시 버림)
+    TRACE_SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'sion-tts-api')
+    
+    # 일괄 TTS 변환 설정
+    TTS_BATCH_MAX_ITEMS = int(os.getenv('TTS_BATCH_MAX_ITEMS', 100))  # 요청 하나에 담을 수 있는 최대 항목 수
+    TTS_BATCH_WINDOW = int(os.getenv('TTS_BATCH_WINDOW', 2))  # 요청 하나가 동시에 합성하는 최대 항목 수 (대화형 요청 몫의 작업 풀 보장)
+    
     # 서버 설정
     PORT = int(os.getenv('PORT', 5000))
+    # eventlet, gevent, threading (없으면 자동 선택)
+    # app.py가 .env를 읽기 전에 몽키 패치를 적용하므로 .env가 아닌 실행 환경 변수로 지정해야 함
+    ASYNC_MODE = os.getenv('ASYNC_MODE') or None
+    WORKER_CONNECTIONS = int(os.getenv('WORKER_CONNECTIONS', 1000))  # 비동기 워커 하나의 최대 동시 연결 수
+    
+    # 업스트림별 최대 동시 요청 수
+    CLAUDE_MAX_CONCURRENCY = int(os.getenv('CLAUDE_MAX_CONCURRENCY', 64))
+    FISH_TTS_MAX_CONCURRENCY = int(os.getenv('FISH_TTS_MAX_CONCURRENCY', 64))
+    STT_MAX_CONCURRENCY = int(os.getenv('STT_MAX_CONCURRENCY', 32))
+    UPSTREAM_ACQUIRE_TIMEOUT = float(os.getenv('UPSTREAM_ACQUIRE_TIMEOUT', 5))  # 빈 자리 대기 시간 (초)
+    
+    # 업스트림별 최대 대기열 길이 (초과 시 대기 없이 즉시 503 응답)
+    CLAUDE_MAX_QUEUE = int(os.getenv('CLAUDE_MAX_QUEUE', 32))
+    FISH_TTS_MAX_QUEUE = int(os.getenv('FISH_TTS_MAX_QUEUE', 32))
+    STT_MAX_QUEUE = int(os.getenv('STT_MAX_QUEUE', 16))
+    
+    # 회로 차단기 설정 (연속 오류/타임아웃이 임계값에 도달하면 일정 시간 요청 차단)
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))  # 차단 후 시험 요청까지 대기 (초)
+    
+    # 외부 HTTP 호출 설정 (Fish TTS 등)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))  # 캐시할 호스트별 연결 풀 수
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 20))  # 호스트별 최대 유지 연결 수
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))  # 연결 타임아웃 (초)
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 60))  # 응답 대기 타임아웃 (초)
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))  # 429/5xx/연결 실패 시 재시도 횟수
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.5))  # 재시도 백오프 계수 (초)
+    
+    # 음성 인식 설정
+    STT_OPERATION_TIMEOUT = float(os.getenv('STT_OPERATION_TIMEOUT', 15))  # Google 음성 인식 요청 타임아웃 (초)
+    
+    # 오디오 변환 설정 (pydub/ffmpeg 프로세스 풀)
+    TRANSCODE_WORKERS = int(os.getenv('TRANSCODE_WORKERS', os.cpu_count() or 2))  # 변환 작업 프로세스 수
+    TRANSCODE_MAX_QUEUE = int(os.getenv('TRANSCODE_MAX_QUEUE', 16))  # 최대 대기 작업 수 (초과 시 429)
+    TRANSCODE_TIMEOUT = float(os.getenv('TRANSCODE_TIMEOUT', 30))  # 작업 하나의 최대 대기 시간 (초)
     
     # Claude API 설정
     CLAUDE_MODEL = "claude-3-5-sonnet-20241022"  # 사용할 모델 버전
+    CLAUDE_SUMMARY_MODEL = os.getenv('CLAUDE_SUMMARY_MODEL', "claude-3-5-haiku-20241022")  # 대화 요약용 모델
+    CLAUDE_HISTORY_TOKEN_BUDGET = int(os.getenv('CLAUDE_HISTORY_TOKEN_BUDGET', 6000))  # 대화 기록(요약 포함) 토큰 예산
+    CLAUDE_SUMMARY_MAX_TOKENS = int(os.getenv('CLAUDE_SUMMARY_MAX_TOKENS', 500))  # 요약문 최대 토큰 수
+    CLAUDE_HISTORY_COMPACT_STEP = int(os.getenv('CLAUDE_HISTORY_COMPACT_STEP', 8))  # 요약 갱신 단위 (메시지 수)
+    CLAUDE_SUMMARY_CHUNK_TOKENS = int(os.getenv('CLAUDE_SUMMARY_CHUNK_TOKENS', 4000))  # 요약 요청 하나에 담을 대화 토큰 수 (긴 대화는 나눠서 요약)
+    CLAUDE_SUMMARY_CACHE_SIZE = int(os.getenv('CLAUDE_SUMMARY_CACHE_SIZE', 1000))  # 캐시할 요약 수
+    CLAUDE_SUMMARY_CACHE_TTL = int(os.getenv('CLAUDE_SUMMARY_CACHE_TTL', 6 * 3600))  # 요약 캐시 유효 시간 (초)
     
     # 데이터베이스 설정
     DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -31,9 +129,27 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     
+    # 데이터베이스 연결 풀 설정
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))  # 유지할 연결 수
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))  # 부하 시 추가로 열 수 있는 연결 수
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))  # 빈 연결 대기 시간 (초)
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # 연결 재생성 주기 (초, MariaDB wait_timeout보다 짧게)
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'  # 사용 전 연결 상태 확인
+    DB_POOL_WARMUP = os.getenv('DB_POOL_WARMUP', 'true').lower() == 'true'  # 시작 시 DB_POOL_SIZE만큼 미리 연결
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', 5))  # 연결 타임아웃 (초)
+    DB_READ_TIMEOUT = int(os.getenv('DB_READ_TIMEOUT', 30))  # 쿼리 결과 읽기 타임아웃 (초)
+    DB_WRITE_TIMEOUT = int(os.getenv('DB_WRITE_TIMEOUT', 30))  # 쿼리 전송 타임아웃 (초)
+    
     # 기타 설정
     MAX_AUDIO_LENGTH = 60  # 최대 오디오 길이 (초)
     
+    # 실시간 스트리밍 세션 버퍼 설정
+    STREAM_SESSION_MAX_BYTES = int(os.getenv('STREAM_SESSION_MAX_BYTES', 2 * 1024 * 1024))  # 세션당 최대 버퍼 크기
+    STREAM_SESSION_IDLE_TTL = float(os.getenv('STREAM_SESSION_IDLE_TTL', 120))  # 유휴 세션 만료 시간 (초)
+    STREAM_SESSION_SWEEP_INTERVAL = float(os.getenv('STREAM_SESSION_SWEEP_INTERVAL', 30))  # 유휴 세션을 백그라운드에서 정리하는 주기 (초)
+    STREAM_BUFFER_GLOBAL_MAX_BYTES = int(os.getenv('STREAM_BUFFER_GLOBAL_MAX_BYTES', 128 * 1024 * 1024))  # 전체 버퍼 상한
+    STREAM_BUFFER_SEGMENT_SIZE = int(os.getenv('STREAM_BUFFER_SEGMENT_SIZE', 64 * 1024))  # 버퍼 세그먼트 크기
+    
     @classmethod
     def init_app(cls, app):
         """Flask 앱에 설정 적용"""
@@ -0,0 +1,35 @@
+# gunicorn 설정 파일
+# 실행: gunicorn -c gunicorn.conf.py app:app
+import os
+
+# 비동기 모드에 맞는 워커 클래스 선택
+# Flask-SocketIO는 세션 고정(sticky session) 없이 여러 워커를 쓸 수 없으므로 워커는 1개가 기본값
+_async_mode = os.getenv('ASYNC_MODE')
+if _async_mode == 'eventlet':
+    worker_class = 'eventlet'
+elif _async_mode == 'gevent':
+    worker_class = 'geventwebsocket.gunicorn.workers.GeventWebSocketWorker'
+else:
+    worker_class = 'gthread'
+    threads = int(os.getenv('WORKER_THREADS', 32))
+
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', 1000))  # 비동기 워커 하나의 최대 동시 연결 수
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# 외부 API 응답을 오래 기다리는 스트리밍 요청이 있으므로 넉넉하게 설정
+timeout = int(os.getenv('WORKER_TIMEOUT', 120))
+keepalive = 5
+
+# 마스터에서 앱을 미리 불러온 뒤 fork하면 불러온 모듈을 워커들이 공유하여 워커 시작이 빨라지고 메모리도 절약됨
+# (.env가 아닌 실행 환경 변수로 지정, --preload 명령행 옵션도 사용 가능)
+preload_app = os.getenv('PRELOAD_APP', 'false').lower() == 'true'
+
+# 앱 로드 전에 설정되므로 app.py는 gunicorn에서 불러올 때 워커 초기화를 하지 않고 post_worker_init에 맡김
+# (preload 여부와 관계없이 마스터에서는 DB 연결/작업 풀/스레드를 만들지 않음)
+os.environ['GUNICORN_MANAGED'] = 'true'
+
+def post_worker_init(worker):
+    """워커 프로세스에서 앱을 불러온 뒤 워커별 초기화 (preload 여부와 관계없이 워커에서만 실행)"""
+    from app import init_worker
+    init_worker()
@@ -0,0 +1,100 @@
+"""
+버전 관리되는 DB 스키마 마이그레이션
+
+워커 프로세스 시작 시에는 DDL을 실행하지 않고, 배포 시 별도 명령으로 한 번만 실행:
+    python -m migrations            # 최신 버전까지 적용
+    python -m migrations status     # 현재 버전과 대기 중인 마이그레이션 확인
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from migrations import m0001_initial_schema, m0002_performance_indexes, m0003_import_json_voice_models
+
+# 적용 순서대로 나열 (각 모듈은 VERSION, DESCRIPTION, upgrade(connection)를 가짐)
+# 파일 이동처럼 DB 밖의 작업은 커밋 후에 실행되도록 선택적으로 after_commit()에 둠
+MIGRATIONS = [
+    m0001_initial_schema,
+    m0002_performance_indexes,
+    m0003_import_json_voice_models,
+]
+
+# 여러 서버에서 동시에 실행해도 한 곳에서만 적용되도록 사용하는 MariaDB 이름 잠금
+LOCK_NAME = 'voice_assistant_schema_migrations'
+LOCK_TIMEOUT = 60
+
+_metadata = MetaData()
+
+schema_version = Table(
+    'schema_version', _metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+def get_current_version(connection):
+    """
+    적용된 마지막 마이그레이션 버전 조회
+
+    Args:
+        connection: SQLAlchemy 연결
+
+    Returns:
+        int: 현재 스키마 버전 (아무것도 적용되지 않았으면 0)
+    """
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    versions = connection.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+def get_pending(connection):
+    """아직 적용되지 않은 마이그레이션 모듈 리스트"""
+    current = get_current_version(connection)
+    return [migration for migration in MIGRATIONS if migration.VERSION > current]
+
+def upgrade(engine):
+    """
+    대기 중인 마이그레이션을 순서대로 적용
+
+    Args:
+        engine: SQLAlchemy 엔진
+
+    Returns:
+        list: 적용한 마이그레이션 버전 리스트
+    """
+    applied = []
+    is_mysql = engine.dialect.name == 'mysql'
+
+    with engine.connect() as connection:
+        if is_mysql:
+            locked = connection.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {'name': LOCK_NAME, 'timeout': LOCK_TIMEOUT}
+            ).scalar()
+            if locked != 1:
+                raise RuntimeError("다른 프로세스가 마이그레이션을 실행 중입니다.")
+            connection.commit()
+
+        try:
+            _metadata.create_all(connection, checkfirst=True)
+            connection.commit()
+
+            for migration in get_pending(connection):
+                print(f"마이그레이션 적용 중: {migration.VERSION:04d} {migration.DESCRIPTION}")
+                # MariaDB의 DDL은 암묵적으로 커밋되므로 각 마이그레이션은 다시 실행해도 안전하게 작성
+                migration.upgrade(connection)
+                connection.execute(schema_version.insert().values(
+                    version=migration.VERSION,
+                    description=migration.DESCRIPTION,
+                    applied_at=datetime.utcnow()
+                ))
+                connection.commit()
+                applied.append(migration.VERSION)
+
+                after_commit = getattr(migration, 'after_commit', None)
+                if after_commit:
+                    after_commit()
+        finally:
+            if is_mysql:
+                connection.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': LOCK_NAME})
+                connection.commit()
+
+    return applied
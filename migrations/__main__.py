@@ -0,0 +1,39 @@
+import argparse
+import sys
+from sqlalchemy import create_engine
+from config import Config
+from models import get_database_uri
+from migrations import get_current_version, get_pending, upgrade, MIGRATIONS
+
+def main():
+    parser = argparse.ArgumentParser(description='DB 스키마 마이그레이션')
+    parser.add_argument('command', nargs='?', choices=('upgrade', 'status'), default='upgrade',
+                        help='upgrade: 최신 버전까지 적용 (기본값), status: 현재 버전 확인')
+    args = parser.parse_args()
+
+    engine = create_engine(get_database_uri(Config))
+    try:
+        if args.command == 'status':
+            with engine.connect() as connection:
+                current = get_current_version(connection)
+                pending = get_pending(connection)
+            print(f"현재 스키마 버전: {current} (최신: {MIGRATIONS[-1].VERSION})")
+            for migration in pending:
+                print(f"  대기 중: {migration.VERSION:04d} {migration.DESCRIPTION}")
+            return 0
+
+        applied = upgrade(engine)
+        if applied:
+            print(f"마이그레이션 {len(applied)}개 적용 완료")
+        else:
+            print("적용할 마이그레이션이 없습니다.")
+        return 0
+
+    except Exception as e:
+        print(f"마이그레이션 오류: {str(e)}")
+        return 1
+    finally:
+        engine.dispose()
+
+if __name__ == '__main__':
+    sys.exit(main())
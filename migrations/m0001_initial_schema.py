@@ -0,0 +1,34 @@
+"""기존 db.create_all()이 만들던 users, voice_models 테이블 (이미 있으면 건너뜀)"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+
+VERSION = 1
+DESCRIPTION = 'initial schema (users, voice_models)'
+
+# 이 시점의 스키마를 그대로 기록 (이후 모델이 바뀌어도 이 마이그레이션은 바뀌지 않아야 함)
+_metadata = MetaData()
+
+Table(
+    'users', _metadata,
+    Column('id', Integer, primary_key=True),
+    Column('username', String(64), unique=True, index=True, nullable=False),
+    Column('email', String(120), unique=True, index=True, nullable=False),
+    Column('password_hash', String(128), nullable=False),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime)
+)
+
+Table(
+    'voice_models', _metadata,
+    Column('id', Integer, primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+    Column('model_name', String(128), nullable=False),
+    Column('reference_id', String(128), nullable=False, unique=True),
+    Column('file_path', String(255)),
+    Column('description', String(255)),
+    Column('status', String(20)),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime)
+)
+
+def upgrade(connection):
+    _metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,19 @@
+"""음성 모델 조회용 복합 인덱스 추가"""
+from sqlalchemy import inspect, text
+
+VERSION = 2
+DESCRIPTION = 'voice_models (user_id, status) and (status, updated_at) indexes'
+
+INDEXES = {
+    # 사용자별·상태별 모델 목록 조회
+    'ix_voice_models_user_id_status': ('voice_models', ('user_id', 'status')),
+    # 시작 시 멈춘 'processing' 작업 검색
+    'ix_voice_models_status_updated_at': ('voice_models', ('status', 'updated_at')),
+}
+
+def upgrade(connection):
+    for name, (table, columns) in INDEXES.items():
+        existing = {index['name'] for index in inspect(connection).get_indexes(table)}
+        if name in existing:
+            continue
+        connection.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
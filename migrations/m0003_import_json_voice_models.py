@@ -0,0 +1,65 @@
+"""예전 방식의 사용자별 JSON 파일({user_id}_models.json)을 voice_models 테이블로 이전"""
+import glob
+import json
+import os
+from datetime import datetime
+from sqlalchemy import text
+from config import Config
+
+VERSION = 3
+DESCRIPTION = 'import legacy per-user voice model JSON files'
+
+# 이번 실행에서 가져온 파일 (커밋된 뒤 after_commit에서 표시)
+_imported_paths = []
+
+def upgrade(connection):
+    _imported_paths.clear()
+    for json_path in glob.glob(os.path.join(Config.VOICE_MODELS_DIR, '*_models.json')):
+        try:
+            user_id = int(os.path.basename(json_path)[:-len('_models.json')])
+            with open(json_path, 'r') as f:
+                entries = json.load(f)
+        except (ValueError, OSError) as e:
+            print(f"음성 모델 JSON 이전 건너뜀 ({json_path}): {str(e)}")
+            continue
+
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            print(f"음성 모델 JSON 이전 건너뜀 ({json_path}): 모델 정보 목록 형식이 아닙니다.")
+            continue
+
+        now = datetime.utcnow()
+        for entry in entries:
+            reference_id = entry.get('reference_id') or entry.get('id')
+            if not reference_id:
+                continue
+
+            exists = connection.execute(
+                text("SELECT 1 FROM voice_models WHERE reference_id = :reference_id"),
+                {'reference_id': reference_id}
+            ).first()
+            if exists:
+                continue
+
+            connection.execute(
+                text("INSERT INTO voice_models "
+                     "(user_id, model_name, reference_id, description, status, created_at, updated_at) "
+                     "VALUES (:user_id, :model_name, :reference_id, :description, 'active', :now, :now)"),
+                {
+                    'user_id': user_id,
+                    'model_name': entry.get('model_name') or f"{user_id}_voice_model",
+                    'reference_id': reference_id,
+                    'description': entry.get('description'),
+                    'now': now
+                }
+            )
+
+        _imported_paths.append(json_path)
+
+def after_commit():
+    """다시 처리하지 않도록 이전한 파일 표시 (DB 반영이 확정된 뒤에만 실행)"""
+    for json_path in _imported_paths:
+        try:
+            os.replace(json_path, json_path + '.migrated')
+        except OSError as e:
+            print(f"이전한 음성 모델 JSON 표시 실패 ({json_path}): {str(e)}")
+    _imported_paths.clear()
@@ -1,9 +1,25 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from utils.db_pool import InstrumentedQueuePool, warm_up_pool
 
 # SQLAlchemy 인스턴스 생성
 db = SQLAlchemy()
 
+def get_database_uri(config):
+    """
+    MariaDB 연결 문자열 생성
+    
+    Args:
+        config: 설정 객체
+        
+    Returns:
+        str: SQLAlchemy 연결 문자열
+    """
+    return (
+        f'mysql+pymysql://{config.DB_USER}:{config.DB_PASSWORD}@'
+        f'{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}'
+    )
+
 def init_db(app, config):
     """
     Flask 앱에 데이터베이스 초기화
@@ -13,16 +29,54 @@ def init_db(app, config):
         config: 설정 객체
     """
     # MariaDB 연결 문자열 설정
-    app.config['SQLALCHEMY_DATABASE_URI'] = (
-        f'mysql+pymysql://{config.DB_USER}:{config.DB_PASSWORD}@'
-        f'{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}'
-    )
+    app.config['SQLALCHEMY_DATABASE_URI'] = get_database_uri(config)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SQLALCHEMY_ECHO'] = config.DEBUG  # SQL 쿼리 로깅 (디버그 모드에서만)
     
+    # 연결 풀 설정 (오래 쉬던 연결은 사용 전 확인하고 주기적으로 새로 만듦)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config.DB_POOL_SIZE,
+        'max_overflow': config.DB_MAX_OVERFLOW,
+        'pool_timeout': config.DB_POOL_TIMEOUT,
+        'pool_recycle': config.DB_POOL_RECYCLE,
+        'pool_pre_ping': config.DB_POOL_PRE_PING,
+        'connect_args': {
+            'connect_timeout': config.DB_CONNECT_TIMEOUT,
+            'read_timeout': config.DB_READ_TIMEOUT,
+            'write_timeout': config.DB_WRITE_TIMEOUT
+        }
+    }
+    
     # 앱에 DB 연결
+    # 스키마 생성/변경은 별도 명령(python -m migrations)으로 실행하므로 워커 시작 시 DDL을 실행하지 않음
+    # 실제 연결은 워커별로 init_worker_db에서 엶 (preload 시 마스터의 연결이 워커에 공유되지 않도록)
     db.init_app(app)
+
+def init_worker_db(app, config):
+    """
+    워커 프로세스의 DB 연결 풀 준비
     
-    # 앱 컨텍스트 내에서 모든 테이블 생성
+    Args:
+        app: Flask 애플리케이션 인스턴스
+        config: 설정 객체
+    """
     with app.app_context():
-        db.create_all()
\ No newline at end of file
+        # fork 전에 열린 연결이 있다면 부모 프로세스의 연결을 닫지 않고 풀에서만 버림
+        db.engine.dispose(close=False)
+        
+        # 최소 연결 수만큼 미리 연결 (시작 직후 요청이 몰릴 때 연결 생성 지연 방지)
+        if config.DB_POOL_WARMUP:
+            warm_up_pool(db.engine, config.DB_POOL_SIZE)
+
+def get_db_pool_stats():
+    """
+    DB 연결 풀 사용 현황 반환 (앱 컨텍스트 안에서 호출)
+    
+    Returns:
+        dict: 연결 풀 통계 (계측 풀이 아니면 None)
+    """
+    pool = db.engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return None
@@ -1,6 +1,6 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from models import db
+from utils.password_hasher import get_password_hasher
 
 class User(db.Model):
     """사용자 모델 클래스"""
@@ -23,12 +23,16 @@ class User(db.Model):
         self.set_password(password)
     
     def set_password(self, password):
-        """비밀번호 해시 생성 및 저장"""
-        self.password_hash = generate_password_hash(password)
+        """비밀번호 해시 생성 및 저장 (요청 스레드 밖의 작업 풀에서 계산)"""
+        self.password_hash = get_password_hasher().hash(password)
     
     def check_password(self, password):
-        """비밀번호 검증"""
-        return check_password_hash(self.password_hash, password)
+        """비밀번호 검증 (요청 스레드 밖의 작업 풀에서 계산)"""
+        return get_password_hasher().verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """저장된 해시가 현재 해시 설정(반복 횟수 등)과 다른지 확인"""
+        return get_password_hasher().needs_rehash(self.password_hash)
     
     def to_dict(self):
         """사용자 정보를 딕셔너리로 변환 (API 응답용)"""
@@ -5,6 +5,12 @@ class VoiceModel(db.Model):
     """음성 모델 클래스"""
     
     __tablename__ = 'voice_models'
+    __table_args__ = (
+        # 사용자별·상태별 모델 목록 조회용 복합 인덱스
+        db.Index('ix_voice_models_user_id_status', 'user_id', 'status'),
+        # 시작 시 멈춘 'processing' 작업 검색용 인덱스
+        db.Index('ix_voice_models_status_updated_at', 'status', 'updated_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -12,7 +18,7 @@ class VoiceModel(db.Model):
     reference_id = db.Column(db.String(128), nullable=False, unique=True)  # Fish TTS API에서 제공하는 ID
     file_path = db.Column(db.String(255))  # 로컬에 저장된 원본 오디오 파일 경로 (선택사항)
     description = db.Column(db.String(255))
-    status = db.Column(db.String(20), default='active')  # active, deleted, processing 등
+    status = db.Column(db.String(20), default='active')  # processing(생성 중), active, failed, deleted
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
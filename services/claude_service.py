@@ -1,5 +1,9 @@
+import threading
 import anthropic
 from config import Config
+from services.history_service import ConversationHistoryService, CLAUDE_CLIENT_ERRORS
+from utils.concurrency import get_bulkhead, UpstreamBusyError
+from utils import tracing
 
 class ClaudeService:
     """Claude API와 통신하는 서비스 클래스"""
@@ -8,54 +12,190 @@ class ClaudeService:
         """Claude API 클라이언트 초기화"""
         self.client = anthropic.Anthropic(api_key=Config.CLAUDE_API_KEY)
         self.model = Config.CLAUDE_MODEL
+        # Claude API 동시 요청 수 제한
+        self.bulkhead = get_bulkhead('claude')
+        # 긴 대화 기록을 토큰 예산 안으로 압축 (오래된 대화는 요약)
+        self.history_service = ConversationHistoryService(self.client)
         self.system_prompt = """
         당신은 친절하고 유용한 AI 비서입니다. 사용자의 질문에 명확하고 간결하게 대답해주세요.
         가능한 한 정확한 정보를 제공하되, 확실하지 않은 내용은 솔직하게 모른다고 말해야 합니다.
         """
+        # 토큰 사용량 통계 (프롬프트 캐시 읽기/쓰기 포함)
+        self.usage_stats = {
+            'requests': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_creation_input_tokens': 0,
+            'cache_read_input_tokens': 0
+        }
+        self._usage_lock = threading.Lock()
     
-    def get_response(self, user_message, conversation_history=None):
+    @tracing.traced('claude.get_response')
+    def get_response(self, user_message, conversation_history=None, conversation_id=None):
         """
         Claude API에 메시지를 보내고 응답을 받음
         
         Args:
             user_message (str): 사용자 메시지
             conversation_history (list, optional): 이전 대화 기록
+            conversation_id (str, optional): 대화 식별자 (요약 캐시 구분용)
             
         Returns:
             str: Claude의 응답
         """
         try:
-            # 대화 기록이 없으면 빈 리스트로 초기화
-            if conversation_history is None:
-                conversation_history = []
+            system, messages = self._build_request(user_message, conversation_history, conversation_id)
             
-            # 메시지 구성
-            messages = [
-                {
-                    "role": "system",
-                    "content": self.system_prompt
-                }
-            ]
+            # API 호출
+            with self.bulkhead.call(ignore_errors=CLAUDE_CLIENT_ERRORS):
+                response = self.client.messages.create(
+                    model=self.model,
+                    system=system,
+                    messages=messages,
+                    max_tokens=2000
+                )
+            self._record_usage(response.usage)
             
-            # 대화 기록 추가
-            for message in conversation_history:
-                messages.append(message)
+            return response.content[0].text
             
-            # 사용자 메시지 추가
-            messages.append({
-                "role": "user",
-                "content": user_message
-            })
+        except UpstreamBusyError:
+            raise
+        except Exception as e:
+            print(f"Claude API 오류: {str(e)}")
+            return "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
+    
+    def stream_response(self, user_message, conversation_history=None, conversation_id=None):
+        """
+        Claude API 스트리밍으로 응답 텍스트를 생성되는 대로 전달
+        
+        Args:
+            user_message (str): 사용자 메시지
+            conversation_history (list, optional): 이전 대화 기록
+            conversation_id (str, optional): 대화 식별자 (요약 캐시 구분용)
             
-            # API 호출
-            response = self.client.messages.create(
+        Yields:
+            str: 응답 텍스트 조각 (delta)
+        """
+        has_output = False
+        try:
+            system, messages = self._build_request(user_message, conversation_history, conversation_id)
+            
+            # 스트림이 끝날 때까지 동시 요청 자리를 유지
+            with self.bulkhead.call(ignore_errors=CLAUDE_CLIENT_ERRORS), self.client.messages.stream(
                 model=self.model,
+                system=system,
                 messages=messages,
                 max_tokens=2000
-            )
-            
-            return response.content[0].text
-            
+            ) as stream:
+                for text in stream.text_stream:
+                    has_output = True
+                    yield text
+                
+                self._record_usage(stream.get_final_message().usage)
+                    
+        except UpstreamBusyError:
+            # 혼잡 시에는 안내 문구 대신 호출한 쪽에서 503으로 응답하도록 전달
+            raise
         except Exception as e:
-            print(f"Claude API 오류: {str(e)}")
-            return "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
\ No newline at end of file
+            print(f"Claude API 스트리밍 오류: {str(e)}")
+            if not has_output:
+                yield "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
+    
+    def get_usage_stats(self):
+        """
+        누적 토큰 사용량 통계 반환
+        
+        Returns:
+            dict: 입력/출력 토큰 수와 프롬프트 캐시 쓰기/읽기 토큰 수, 캐시 적중률
+        """
+        with self._usage_lock:
+            stats = dict(self.usage_stats)
+        
+        total_input = (stats['input_tokens'] + stats['cache_creation_input_tokens']
+                       + stats['cache_read_input_tokens'])
+        stats['cache_read_ratio'] = stats['cache_read_input_tokens'] / total_input if total_input else 0.0
+        return stats
+    
+    def _record_usage(self, usage):
+        """API 응답의 토큰 사용량 누적"""
+        if usage is None:
+            return
+        
+        with self._usage_lock:
+            self.usage_stats['requests'] += 1
+            for field in ('input_tokens', 'output_tokens',
+                          'cache_creation_input_tokens', 'cache_read_input_tokens'):
+                self.usage_stats[field] += getattr(usage, field, None) or 0
+    
+    @tracing.traced('claude.build_request')
+    def _build_request(self, user_message, conversation_history=None, conversation_id=None):
+        """
+        API 요청용 시스템 프롬프트와 메시지 목록 구성
+        
+        고정된 시스템 프롬프트, 대화 요약, 이전 대화 기록의 끝에 캐시 지점(cache_control)을
+        지정하여 매 턴 반복되는 접두부를 프롬프트 캐시에서 읽도록 함
+        
+        Returns:
+            tuple: (system 블록 리스트, 메시지 리스트)
+        """
+        # 대화 기록이 없으면 빈 리스트로 초기화
+        if conversation_history is None:
+            conversation_history = []
+        
+        # 오래된 대화는 요약으로 대체하고 최근 대화만 유지
+        summary, recent_history = self.history_service.compact(conversation_history, conversation_id)
+        
+        # 시스템 프롬프트는 messages가 아닌 system 파라미터로 전달 (빈 텍스트에는 캐시 지점을 둘 수 없음)
+        system = []
+        if self.system_prompt and self.system_prompt.strip():
+            system.append({
+                "type": "text",
+                "text": self.system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            })
+        
+        # 요약은 여러 턴 동안 유지되므로 별도 캐시 지점으로 지정
+        if summary and summary.strip():
+            system.append({
+                "type": "text",
+                "text": f"[이전 대화 요약]\n{summary}",
+                "cache_control": {"type": "ephemeral"}
+            })
+        
+        # 대화 기록 추가
+        messages = list(recent_history)
+        
+        # 이전 대화의 마지막 메시지까지를 캐시 지점으로 지정
+        if messages:
+            messages[-1] = self._with_cache_control(messages[-1])
+        
+        # 사용자 메시지 추가
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+        
+        return system, messages
+    
+    @staticmethod
+    def _with_cache_control(message):
+        """
+        메시지의 마지막 콘텐츠 블록에 cache_control을 지정한 복사본 반환 (원본은 변경하지 않음)
+        
+        마지막 블록이 비어 있거나 공백뿐인 텍스트면 API가 캐시 지점을 거부하므로 원본을 그대로 반환
+        """
+        content = message.get('content', '')
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = [dict(block) for block in content]
+        
+        if not blocks:
+            return message
+        
+        last = blocks[-1]
+        if last.get("type") == "text" and not (last.get("text") or "").strip():
+            return message
+        
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        return {**message, "content": blocks}
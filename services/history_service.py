@@ -0,0 +1,209 @@
+import hashlib
+import json
+import math
+from functools import lru_cache
+import anthropic
+from config import Config
+from utils.cache_utils import TTLCache
+from utils.concurrency import get_bulkhead
+
+# 요청 내용/인증 문제로 인한 오류 (업스트림 장애가 아니므로 회로 차단기 실패로 세지 않음)
+# 429(RateLimitError)와 5xx, 타임아웃, 연결 오류만 실패로 집계
+CLAUDE_CLIENT_ERRORS = (
+    anthropic.BadRequestError,
+    anthropic.AuthenticationError,
+    anthropic.PermissionDeniedError,
+    anthropic.NotFoundError,
+    anthropic.ConflictError,
+    anthropic.UnprocessableEntityError
+)
+
+# 메시지 하나당 역할/구분자 등에 드는 대략적인 토큰 수
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """
+다음은 사용자와 AI 비서의 이전 대화입니다. 이후 대화를 이어가는 데 필요한 사실, 사용자의 요청과 선호,
+결정된 사항을 빠짐없이 담아 한국어로 간결하게 요약해주세요. 기존 요약이 있으면 새 대화 내용을 반영해 갱신하세요.
+"""
+
+@lru_cache(maxsize=4096)
+def _count_text_tokens(text):
+    """
+    텍스트의 토큰 수 추정 (API 호출 없는 근사치)
+
+    영문/숫자는 약 4자당 1토큰, 한글 등 비 ASCII 문자는 약 1자당 1토큰으로 계산
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+def message_text(message):
+    """메시지 content(문자열 또는 블록 리스트)에서 텍스트만 추출"""
+    content = message.get('content', '')
+    if isinstance(content, str):
+        return content
+    return ''.join(block.get('text', '') for block in content if isinstance(block, dict))
+
+def count_message_tokens(message):
+    """메시지 하나의 토큰 수 추정"""
+    return _count_text_tokens(message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+
+class ConversationHistoryService:
+    """대화 기록을 토큰 예산 안으로 유지하는 서비스 (오래된 대화는 요약으로 대체)"""
+
+    def __init__(self, client, model=None):
+        """
+        서비스 초기화
+
+        Args:
+            client: Anthropic API 클라이언트 (요약 생성용)
+            model (str, optional): 요약에 사용할 모델
+        """
+        self.client = client
+        self.model = model or Config.CLAUDE_SUMMARY_MODEL
+        self.bulkhead = get_bulkhead('claude')
+        self.token_budget = Config.CLAUDE_HISTORY_TOKEN_BUDGET
+        self.summary_max_tokens = Config.CLAUDE_SUMMARY_MAX_TOKENS
+        self.compact_step = max(2, Config.CLAUDE_HISTORY_COMPACT_STEP)
+        self.summary_chunk_tokens = Config.CLAUDE_SUMMARY_CHUNK_TOKENS
+        # 대화 접두부 해시 -> 요약 (대화별로 점진적으로 갱신)
+        self.summary_cache = TTLCache(
+            maxsize=Config.CLAUDE_SUMMARY_CACHE_SIZE,
+            ttl=Config.CLAUDE_SUMMARY_CACHE_TTL
+        )
+
+    def compact(self, conversation_history, conversation_id=None):
+        """
+        대화 기록을 토큰 예산에 맞게 압축
+
+        최근 대화는 그대로 두고, 예산을 넘는 오래된 대화는 요약문으로 대체
+        잘라내는 위치는 compact_step 단위로 맞춰 여러 턴 동안 같은 요약을 재사용
+
+        Args:
+            conversation_history (list): 이전 대화 기록
+            conversation_id (str, optional): 대화 식별자 (요약 캐시 구분용)
+
+        Returns:
+            tuple: (요약문 또는 None, 유지할 최근 메시지 리스트)
+        """
+        if not conversation_history:
+            return None, []
+
+        # 요약문이 차지할 자리를 남겨두고 최근 메시지부터 예산 안에 담음
+        window_budget = self.token_budget - self.summary_max_tokens
+        used = 0
+        keep_from = len(conversation_history)
+        for index in range(len(conversation_history) - 1, -1, -1):
+            used += count_message_tokens(conversation_history[index])
+            if used > window_budget:
+                break
+            keep_from = index
+
+        if keep_from == 0:
+            return None, list(conversation_history)
+
+        # 잘라낼 위치를 compact_step 단위로 올림 → 매 턴마다 요약을 다시 만들지 않음
+        cut = math.ceil(keep_from / self.compact_step) * self.compact_step
+        cut = min(cut, len(conversation_history))
+
+        # 남은 대화는 사용자 메시지로 시작해야 함
+        while cut < len(conversation_history) and conversation_history[cut].get('role') != 'user':
+            cut += 1
+
+        summary, covered = self._get_summary(conversation_history, cut, conversation_id)
+        if covered < cut:
+            # 요약하지 못한 메시지는 예산을 넘더라도 버리지 않고 그대로 유지
+            # (요약과 일부 겹치더라도 남은 대화가 사용자 메시지로 시작하도록 앞쪽으로 맞춤)
+            print(f"대화 요약 일부 실패: {cut}개 중 {covered}개만 요약되어 나머지는 원문으로 유지합니다.")
+            cut = covered
+            while cut > 0 and conversation_history[cut].get('role') != 'user':
+                cut -= 1
+            if cut == 0:
+                return None, list(conversation_history)
+        return summary, list(conversation_history[cut:])
+
+    def _get_summary(self, conversation_history, cut, conversation_id):
+        """
+        앞쪽 cut개 메시지의 요약 반환 (캐시된 가장 긴 접두부 요약에서 이어서 갱신)
+
+        요약할 대화가 길면 summary_chunk_tokens 단위로 나눠 순서대로 요약을 갱신하고
+        중간 결과도 캐시하여 실패하더라도 다음 요청에서 이어서 진행
+
+        Returns:
+            tuple: (요약문 또는 None, 요약에 반영된 앞쪽 메시지 수 - 요약 실패 시 cut보다 작음)
+        """
+        prefix_keys = self._prefix_keys(conversation_history[:cut], conversation_id)
+
+        summary = self.summary_cache.get(prefix_keys[cut])
+        if summary is not None:
+            return summary, cut
+
+        # 캐시에 있는 가장 긴 접두부 요약 찾기
+        start = 0
+        previous_summary = None
+        for index in range(cut - 1, 0, -1):
+            cached = self.summary_cache.get(prefix_keys[index])
+            if cached is not None:
+                start, previous_summary = index, cached
+                break
+
+        summary = previous_summary
+        index = start
+        while index < cut:
+            end = self._chunk_end(conversation_history, index, cut)
+            chunk_summary = self._summarize(summary, conversation_history[index:end])
+            if chunk_summary is None:
+                # 요약 실패 시 지금까지 만든 요약과 그 요약이 다루는 위치 반환
+                return summary, index
+            summary = chunk_summary
+            index = end
+            self.summary_cache.set(prefix_keys[index], summary)
+        return summary, cut
+
+    def _chunk_end(self, messages, start, cut):
+        """start부터 summary_chunk_tokens 안에 들어가는 마지막 위치 (최소 메시지 하나는 포함)"""
+        used = 0
+        end = start
+        while end < cut:
+            used += count_message_tokens(messages[end])
+            if used > self.summary_chunk_tokens and end > start:
+                break
+            end += 1
+        return end
+
+    @staticmethod
+    def _prefix_keys(messages, conversation_id):
+        """각 접두부(메시지 0..i)에 대한 연쇄 해시 키 리스트 (길이 len(messages)+1)"""
+        digest = hashlib.sha256((conversation_id or '').encode('utf-8')).hexdigest()
+        keys = [digest]
+        for message in messages:
+            raw = json.dumps(
+                [digest, message.get('role'), message_text(message)],
+                ensure_ascii=False
+            )
+            digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+            keys.append(digest)
+        return keys
+
+    def _summarize(self, previous_summary, messages):
+        """이전 요약과 새 메시지들을 합쳐 새 요약 생성"""
+        try:
+            lines = []
+            if previous_summary:
+                lines.append(f"[기존 요약]\n{previous_summary}\n")
+            lines.append("[새 대화]")
+            for message in messages:
+                speaker = "사용자" if message.get('role') == 'user' else "AI"
+                lines.append(f"{speaker}: {message_text(message)}")
+
+            with self.bulkhead.call(ignore_errors=CLAUDE_CLIENT_ERRORS):
+                response = self.client.messages.create(
+                    model=self.model,
+                    system=SUMMARY_PROMPT,
+                    messages=[{"role": "user", "content": "\n".join(lines)}],
+                    max_tokens=self.summary_max_tokens
+                )
+            return response.content[0].text
+
+        except Exception as e:
+            print(f"대화 요약 오류: {str(e)}")
+            return None
@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+
+class SessionBufferStore:
+    """스트리밍 세션별 오디오 버퍼 저장소 (세션별 용량 제한, 유휴 만료, 전체 메모리 상한)"""
+
+    def __init__(self, session_max_bytes=None, idle_ttl=None, global_max_bytes=None, sweep_interval=None):
+        """
+        저장소 초기화
+
+        Args:
+            session_max_bytes (int, optional): 세션 하나가 보관할 수 있는 최대 오디오 크기 (바이트)
+            idle_ttl (float, optional): 이 시간(초) 동안 오디오가 없는 세션은 제거
+            global_max_bytes (int, optional): 전체 세션 버퍼의 최대 크기 (초과 시 오래된 세션부터 제거)
+            sweep_interval (float, optional): 오디오 수신과 관계없이 유휴 세션을 정리하는 주기 (초)
+        """
+        self.session_max_bytes = session_max_bytes or Config.STREAM_SESSION_MAX_BYTES
+        self.idle_ttl = idle_ttl or Config.STREAM_SESSION_IDLE_TTL
+        self.global_max_bytes = global_max_bytes or Config.STREAM_BUFFER_GLOBAL_MAX_BYTES
+        self.sweep_interval = sweep_interval or Config.STREAM_SESSION_SWEEP_INTERVAL
+
+        # 세션 ID -> (버퍼 객체, 마지막 활동 시각), 오래전에 활동한 세션이 앞쪽
+        self._sessions = OrderedDict()
+        self.lock = threading.RLock()
+
+        self.evicted_idle = 0
+        self.evicted_memory = 0
+
+        self._sweeper_pid = None  # 정리 스레드를 시작한 프로세스 (fork 후에는 다시 시작)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id):
+        """
+        세션 버퍼 조회 (조회 시 활동 시각 갱신)
+
+        Args:
+            session_id (str): 소켓 세션 ID
+
+        Returns:
+            세션 버퍼 객체 또는 None
+        """
+        with self.lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions[session_id] = (entry[0], time.monotonic())
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def put(self, session_id, buffer):
+        """
+        세션 버퍼 저장
+
+        Args:
+            session_id (str): 소켓 세션 ID
+            buffer: buffered_bytes 속성과 reset() 메서드를 가진 버퍼 객체
+        """
+        with self.lock:
+            old_entry = self._sessions.pop(session_id, None)
+            if old_entry is not None:
+                old_entry[0].reset()
+            self._sessions[session_id] = (buffer, time.monotonic())
+            self._start_sweeper()
+
+    def remove(self, session_id):
+        """세션 버퍼 제거 및 메모리 해제 (연결 해제 시 호출)"""
+        with self.lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                entry[0].reset()
+
+    def enforce_limits(self):
+        """
+        유휴 세션을 제거하고, 전체 메모리 상한을 넘으면 가장 오래된 세션부터 제거
+
+        Returns:
+            list: 메모리 부족으로 제거된 세션 ID 리스트 (유휴 만료 세션 제외)
+        """
+        shed = []
+
+        with self.lock:
+            # 1. 유휴 세션 제거
+            self.evict_idle()
+
+            # 2. 전체 메모리 상한 적용 (방금 활동한 세션은 마지막까지 유지)
+            total = self.total_bytes()
+            while total > self.global_max_bytes and len(self._sessions) > 1:
+                session_id, (buffer, _) = self._sessions.popitem(last=False)
+                total -= buffer.buffered_bytes
+                buffer.reset()
+                self.evicted_memory += 1
+                shed.append(session_id)
+
+        return shed
+
+    def evict_idle(self):
+        """
+        유휴 만료된 세션 제거 (오디오 수신 중이 아니어도 정리 스레드와 메트릭 조회에서 호출)
+
+        Returns:
+            int: 제거된 세션 수
+        """
+        now = time.monotonic()
+        evicted = 0
+        with self.lock:
+            # 앞쪽이 가장 오래전에 활동한 세션
+            while self._sessions:
+                session_id, (buffer, last_seen) = next(iter(self._sessions.items()))
+                if now - last_seen < self.idle_ttl:
+                    break
+                self._sessions.popitem(last=False)
+                buffer.reset()
+                evicted += 1
+            self.evicted_idle += evicted
+        return evicted
+
+    def _start_sweeper(self):
+        """유휴 세션 정리 스레드를 프로세스마다 한 번 시작 (lock 보유 상태에서 호출)"""
+        if self._sweeper_pid == os.getpid():
+            return
+        self._sweeper_pid = os.getpid()
+        threading.Thread(target=self._sweep, daemon=True, name='stream-session-sweeper').start()
+
+    def _sweep(self):
+        """정리 스레드 본문"""
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"유휴 세션 정리 오류: {str(e)}")
+
+    def total_bytes(self):
+        """전체 세션이 사용 중인 버퍼 크기 (바이트)"""
+        with self.lock:
+            return sum(buffer.buffered_bytes for buffer, _ in self._sessions.values())
+
+    def stats(self):
+        """저장소 사용 현황 반환 (조회 전에 유휴 세션 정리)"""
+        with self.lock:
+            self.evict_idle()
+            return {
+                'sessions': len(self._sessions),
+                'total_bytes': self.total_bytes(),
+                'global_max_bytes': self.global_max_bytes,
+                'session_max_bytes': self.session_max_bytes,
+                'evicted_idle': self.evicted_idle,
+                'evicted_memory': self.evicted_memory
+            }
@@ -1,8 +1,10 @@
 import speech_recognition as sr
 import io
-import os
-import tempfile
-from pydub import AudioSegment
+from config import Config
+from services.transcode_service import get_transcode_service, TranscodeQueueFullError
+from services.stream_segmenter import UtteranceSegmenter
+from utils.concurrency import get_bulkhead, UpstreamBusyError
+from utils import tracing
 
 class SpeechService:
     """음성 인식 관련 기능을 제공하는 서비스 클래스"""
@@ -15,60 +17,93 @@ class SpeechService:
         self.recognizer.energy_threshold = 300  # 음성 감지 임계값
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8  # 말 사이 최대 멈춤 시간 (초)
+        self.recognizer.operation_timeout = Config.STT_OPERATION_TIMEOUT  # 인식 요청 타임아웃 (초)
+        
+        # 오디오 변환은 요청 스레드가 아닌 프로세스 풀에서 수행
+        self.transcode_service = get_transcode_service()
+        # Google 음성 인식 동시 요청 수 제한
+        self.bulkhead = get_bulkhead('google_stt')
     
+    @tracing.traced('stt.speech_to_text')
     def speech_to_text(self, audio_data, language="ko-KR"):
         """
         음성 데이터를 텍스트로 변환
         
         Args:
-            audio_data (bytes): 오디오 파일 데이터
+            audio_data (bytes | sr.AudioData): WAV 파일 데이터 또는 디코딩된 오디오
             language (str): 인식할 언어 코드
             
         Returns:
             str: 인식된 텍스트
         """
         try:
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
-            
-            # 오디오 파일 로드 및 인식
-            with sr.AudioFile(temp_path) as source:
-                audio = self.recognizer.record(source)
-            
-            # 임시 파일 삭제
-            os.unlink(temp_path)
+            if isinstance(audio_data, sr.AudioData):
+                audio = audio_data
+            else:
+                # 임시 파일 없이 메모리에서 바로 로드
+                with sr.AudioFile(io.BytesIO(audio_data)) as source:
+                    audio = self.recognizer.record(source)
             
             # Google 음성 인식 API 사용하여 텍스트 변환
-            text = self.recognizer.recognize_google(audio, language=language)
+            with self.bulkhead.call(ignore_errors=(sr.UnknownValueError,)):
+                text = self.recognizer.recognize_google(audio, language=language)
             return text
             
         except sr.UnknownValueError:
             return "음성을 인식할 수 없었습니다."
         except sr.RequestError as e:
             return f"음성 인식 서비스 오류: {e}"
+        except UpstreamBusyError:
+            raise
         except Exception as e:
             print(f"음성 인식 오류: {str(e)}")
             return "음성 처리 중 오류가 발생했습니다."
     
-    def process_stream_chunk(self, audio_chunk, language="ko-KR"):
+    def create_segmenter(self, sample_rate=16000, sample_width=2, max_bytes=None):
         """
-        실시간 스트리밍 오디오 청크 처리
+        스트리밍 세션용 발화 분할기 생성 (인식기의 에너지/멈춤 임계값 설정 사용)
         
         Args:
-            audio_chunk (bytes): 오디오 데이터 청크
+            sample_rate (int): 스트림 샘플링 레이트 (Hz)
+            sample_width (int): 샘플 크기 (바이트)
+            max_bytes (int, optional): 발화 하나의 최대 버퍼 크기 (바이트)
+            
+        Returns:
+            UtteranceSegmenter: 세션별 발화 분할기
+        """
+        return UtteranceSegmenter(
+            energy_threshold=self.recognizer.energy_threshold,
+            pause_threshold=self.recognizer.pause_threshold,
+            sample_rate=sample_rate,
+            sample_width=sample_width,
+            dynamic_energy_threshold=self.recognizer.dynamic_energy_threshold,
+            dynamic_energy_damping=self.recognizer.dynamic_energy_adjustment_damping,
+            dynamic_energy_ratio=self.recognizer.dynamic_energy_ratio,
+            phrase_threshold=self.recognizer.phrase_threshold,
+            max_utterance_bytes=max_bytes
+        )
+    
+    @tracing.traced('stt.process_stream_chunk')
+    def process_stream_chunk(self, audio_chunk, language="ko-KR", sample_rate=16000, sample_width=2):
+        """
+        실시간 스트리밍에서 분할된 발화 하나를 인식
+        
+        Args:
+            audio_chunk (bytes): 발화 하나의 PCM 오디오 데이터 (create_segmenter로 분할된 것)
             language (str): 인식할 언어 코드
+            sample_rate (int): 샘플링 레이트 (Hz)
+            sample_width (int): 샘플 크기 (바이트)
             
         Returns:
             str: 인식된 텍스트 (있는 경우)
         """
         try:
             # 오디오 데이터를 AudioData 객체로 변환
-            audio_data = sr.AudioData(audio_chunk, 16000, 2)  # 샘플링 레이트와 채널 수를 적절히 조정
+            audio_data = sr.AudioData(audio_chunk, sample_rate, sample_width)
             
             # 음성 인식 (음성이 확실한 경우에만)
-            text = self.recognizer.recognize_google(audio_data, language=language)
+            with self.bulkhead.call(ignore_errors=(sr.UnknownValueError,)):
+                text = self.recognizer.recognize_google(audio_data, language=language)
             return text
             
         except sr.UnknownValueError:
@@ -78,6 +113,35 @@ class SpeechService:
             print(f"스트리밍 오디오 처리 오류: {str(e)}")
             return None
     
+    @tracing.traced('stt.decode_audio')
+    def decode_audio(self, audio_data, input_format="webm"):
+        """
+        업로드된 오디오를 디코딩하여 음성 인식기 입력(AudioData)으로 변환
+        
+        WAV로 다시 인코딩하지 않고 디코딩된 PCM 버퍼를 그대로 사용
+        
+        Args:
+            audio_data (bytes): 입력 오디오 데이터
+            input_format (str): 입력 형식
+            
+        Returns:
+            sr.AudioData: 모노 PCM 오디오 데이터, 실패 시 None
+            
+        Raises:
+            TranscodeQueueFullError: 변환 대기열이 가득 찬 경우
+        """
+        try:
+            # 음성 인식기는 모노 PCM을 기대함
+            pcm_data, sample_rate, sample_width = self.transcode_service.decode(audio_data, input_format)
+            return sr.AudioData(pcm_data, sample_rate, sample_width)
+            
+        except TranscodeQueueFullError:
+            raise
+        except Exception as e:
+            print(f"오디오 디코딩 오류: {str(e)}")
+            return None
+    
+    @tracing.traced('stt.convert_audio_format')
     def convert_audio_format(self, audio_data, input_format="webm", output_format="wav"):
         """
         오디오 형식 변환
@@ -89,20 +153,16 @@ class SpeechService:
             
         Returns:
             bytes: 변환된 오디오 데이터
+            
+        Raises:
+            TranscodeQueueFullError: 변환 대기열이 가득 찬 경우
         """
         try:
-            # BytesIO 객체로 변환
-            audio_io = io.BytesIO(audio_data)
-            
-            # pydub을 사용하여 오디오 형식 변환
-            audio = AudioSegment.from_file(audio_io, format=input_format)
-            
-            # 출력 형식으로 변환
-            output_io = io.BytesIO()
-            audio.export(output_io, format=output_format)
-            
-            return output_io.getvalue()
+            # pydub/ffmpeg 변환은 프로세스 풀에서 실행
+            return self.transcode_service.convert(audio_data, input_format, output_format)
             
+        except TranscodeQueueFullError:
+            raise
         except Exception as e:
             print(f"오디오 변환 오류: {str(e)}")
             return None
\ No newline at end of file
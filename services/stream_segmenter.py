@@ -0,0 +1,159 @@
+from collections import deque
+from config import Config
+from utils.audio_utils import pcm_rms, SegmentBuffer
+
+class UtteranceSegmenter:
+    """실시간 PCM 스트림을 에너지 기반 음성 구간 검출(VAD)로 발화 단위로 분할하는 클래스"""
+
+    def __init__(self, energy_threshold, pause_threshold, sample_rate=16000, sample_width=2,
+                 dynamic_energy_threshold=False, dynamic_energy_damping=0.15, dynamic_energy_ratio=1.5,
+                 phrase_threshold=0.3, pre_roll=0.3, frame_ms=30, max_utterance_seconds=None,
+                 max_utterance_bytes=None):
+        """
+        분할기 초기화
+
+        Args:
+            energy_threshold (float): 음성으로 판단할 최소 RMS 에너지
+            pause_threshold (float): 발화 종료로 판단할 무음 길이 (초)
+            sample_rate (int): 샘플링 레이트 (Hz)
+            sample_width (int): 샘플 크기 (바이트)
+            dynamic_energy_threshold (bool): 무음 구간 에너지에 따라 임계값 자동 조정 여부
+            dynamic_energy_damping (float): 임계값 조정 감쇠 계수 (초당)
+            dynamic_energy_ratio (float): 배경 소음 대비 음성 에너지 비율
+            phrase_threshold (float): 발화로 인정할 최소 음성 길이 (초, 미만이면 잡음으로 버림)
+            pre_roll (float): 발화 시작 전에 함께 보낼 오디오 길이 (초, 첫 음절 잘림 방지)
+            frame_ms (int): 에너지 판단 단위 프레임 길이 (밀리초)
+            max_utterance_seconds (float, optional): 발화 최대 길이 (초과 시 강제로 분할)
+            max_utterance_bytes (int, optional): 발화 버퍼 최대 크기 (바이트, 초과 시 강제로 분할)
+
+        Raises:
+            ValueError: 프레임 크기가 0 이하가 되는 샘플링 레이트/샘플 크기/프레임 길이인 경우
+        """
+        self.energy_threshold = energy_threshold
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.dynamic_energy_threshold = dynamic_energy_threshold
+        self.dynamic_energy_ratio = dynamic_energy_ratio
+
+        self.frame_seconds = frame_ms / 1000.0
+        self.frame_bytes = int(sample_rate * self.frame_seconds) * sample_width
+        if self.frame_bytes <= 0:
+            raise ValueError(f"프레임 크기가 0 이하입니다. (sample_rate={sample_rate}, sample_width={sample_width}, frame_ms={frame_ms})")
+        self.energy_damping = dynamic_energy_damping ** self.frame_seconds
+
+        self.pause_frames = max(1, int(round(pause_threshold / self.frame_seconds)))
+        self.phrase_frames = max(1, int(round(phrase_threshold / self.frame_seconds)))
+        max_seconds = max_utterance_seconds or Config.MAX_AUDIO_LENGTH
+        self.max_frames = int(max_seconds / self.frame_seconds)
+        if max_utterance_bytes:
+            self.max_frames = max(1, min(self.max_frames, max_utterance_bytes // self.frame_bytes))
+
+        # 발화 시작 전 프레임을 담아두는 링 버퍼
+        self._pre_roll = deque(maxlen=max(1, int(round(pre_roll / self.frame_seconds))))
+        self._pending = bytearray()  # 프레임 크기에 못 미치는 나머지 데이터
+        self._utterance = SegmentBuffer(Config.STREAM_BUFFER_SEGMENT_SIZE)
+        self._in_speech = False
+        self._voiced_frames = 0
+        self._silent_frames = 0
+        self._utterance_frames = 0
+
+    @property
+    def buffered_bytes(self):
+        """현재 보관 중인 오디오가 차지하는 메모리 크기 (바이트)"""
+        return len(self._pending) + self._utterance.allocated_bytes + len(self._pre_roll) * self.frame_bytes
+
+    def reset(self):
+        """보관 중인 오디오를 모두 버리고 메모리 해제"""
+        self._pending = bytearray()
+        self._pre_roll.clear()
+        self._utterance.clear()
+        self._in_speech = False
+        self._voiced_frames = 0
+        self._silent_frames = 0
+        self._utterance_frames = 0
+
+    def feed(self, audio_chunk):
+        """
+        오디오 청크를 추가하고 완성된 발화를 반환
+
+        Args:
+            audio_chunk (bytes): PCM 오디오 청크 (크기는 임의)
+
+        Returns:
+            list: 완성된 발화 PCM 데이터(bytes) 리스트 (없으면 빈 리스트)
+        """
+        self._pending.extend(audio_chunk)
+        utterances = []
+
+        offset = 0
+        while len(self._pending) - offset >= self.frame_bytes:
+            frame = bytes(self._pending[offset:offset + self.frame_bytes])
+            offset += self.frame_bytes
+            utterance = self._process_frame(frame)
+            if utterance is not None:
+                utterances.append(utterance)
+
+        del self._pending[:offset]
+        return utterances
+
+    def flush(self):
+        """
+        스트림 종료 시 진행 중인 발화를 마무리
+
+        Returns:
+            bytes: 마지막 발화 PCM 데이터 또는 None
+        """
+        if self._in_speech and self._pending:
+            self._utterance.extend(self._pending)
+        self._pending.clear()
+        return self._finish_utterance()
+
+    def _process_frame(self, frame):
+        """프레임 하나의 음성 여부를 판단하고 발화 상태를 갱신"""
+        energy = pcm_rms(frame, self.sample_width)
+        is_speech = energy > self.energy_threshold
+
+        if not self._in_speech:
+            if not is_speech:
+                self._adjust_threshold(energy)
+                self._pre_roll.append(frame)
+                return None
+
+            # 발화 시작: 링 버퍼의 직전 오디오부터 포함
+            self._in_speech = True
+            for buffered in self._pre_roll:
+                self._utterance.extend(buffered)
+            self._utterance_frames = len(self._pre_roll)
+            self._pre_roll.clear()
+
+        self._utterance.extend(frame)
+        self._utterance_frames += 1
+
+        if is_speech:
+            self._voiced_frames += 1
+            self._silent_frames = 0
+        else:
+            self._silent_frames += 1
+
+        if self._silent_frames >= self.pause_frames or self._utterance_frames >= self.max_frames:
+            return self._finish_utterance()
+        return None
+
+    def _finish_utterance(self):
+        """현재 발화를 반환하고 상태 초기화 (음성이 너무 짧으면 잡음으로 보고 버림)"""
+        utterance = self._utterance.getvalue() if self._voiced_frames >= self.phrase_frames else None
+
+        self._utterance.clear()
+        self._in_speech = False
+        self._voiced_frames = 0
+        self._silent_frames = 0
+        self._utterance_frames = 0
+        return utterance
+
+    def _adjust_threshold(self, energy):
+        """무음 구간의 배경 소음에 맞춰 에너지 임계값 조정 (SpeechRecognition의 listen()과 같은 방식)"""
+        if not self.dynamic_energy_threshold:
+            return
+        target_energy = energy * self.dynamic_energy_ratio
+        self.energy_threshold = (self.energy_threshold * self.energy_damping
+                                 + target_energy * (1 - self.energy_damping))
@@ -0,0 +1,221 @@
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+from utils.metrics import transcode_duration
+
+class TranscodeQueueFullError(Exception):
+    """변환 작업 대기열이 가득 차서 작업을 받을 수 없을 때 발생"""
+
+
+def _transcode_job(audio_data, input_format, output_format):
+    """
+    작업 프로세스에서 실행되는 오디오 형식 변환 (pydub/ffmpeg)
+
+    Returns:
+        tuple: (변환된 오디오 데이터, 실행 시간(초))
+    """
+    from pydub import AudioSegment
+
+    started = time.perf_counter()
+    audio = AudioSegment.from_file(io.BytesIO(audio_data), format=input_format)
+    output_io = io.BytesIO()
+    audio.export(output_io, format=output_format)
+    return output_io.getvalue(), time.perf_counter() - started
+
+def _decode_job(audio_data, input_format):
+    """
+    작업 프로세스에서 실행되는 오디오 디코딩 (모노 PCM으로 변환)
+
+    Returns:
+        tuple: ((PCM 데이터, 샘플링 레이트, 샘플 크기), 실행 시간(초))
+    """
+    from pydub import AudioSegment
+
+    started = time.perf_counter()
+    audio = AudioSegment.from_file(io.BytesIO(audio_data), format=input_format)
+    if audio.channels != 1:
+        audio = audio.set_channels(1)
+    return (audio.raw_data, audio.frame_rate, audio.sample_width), time.perf_counter() - started
+
+
+class TranscodeService:
+    """오디오 변환을 제한된 프로세스 풀에서 실행하는 서비스 클래스"""
+
+    def __init__(self, max_workers=None, max_queue=None, timeout=None):
+        """
+        서비스 초기화
+
+        Args:
+            max_workers (int, optional): 변환 작업 프로세스 수
+            max_queue (int, optional): 실행 대기 가능한 최대 작업 수 (초과 시 거절)
+            timeout (float, optional): 작업 하나의 최대 대기 시간 (초)
+        """
+        self.max_workers = max_workers or Config.TRANSCODE_WORKERS
+        self.max_queue = max_queue if max_queue is not None else Config.TRANSCODE_MAX_QUEUE
+        self.timeout = timeout or Config.TRANSCODE_TIMEOUT
+
+        # 작업 프로세스는 재사용되므로 pydub 로드와 ffmpeg 탐색은 프로세스당 한 번만 수행
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # 실행 중 + 대기 중인 작업 수 제한 (백프레셔)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+
+        # 작업 통계
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed_jobs = 0
+        self.failed_jobs = 0
+        self.rejected_jobs = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    def convert(self, audio_data, input_format="webm", output_format="wav"):
+        """
+        오디오 형식 변환
+
+        Args:
+            audio_data (bytes): 입력 오디오 데이터
+            input_format (str): 입력 형식
+            output_format (str): 출력 형식
+
+        Returns:
+            bytes: 변환된 오디오 데이터
+
+        Raises:
+            TranscodeQueueFullError: 대기열이 가득 찬 경우
+        """
+        return self._run('convert', _transcode_job, audio_data, input_format, output_format)
+
+    def decode(self, audio_data, input_format="webm"):
+        """
+        오디오를 모노 PCM으로 디코딩
+
+        Args:
+            audio_data (bytes): 입력 오디오 데이터
+            input_format (str): 입력 형식
+
+        Returns:
+            tuple: (PCM 데이터, 샘플링 레이트, 샘플 크기)
+
+        Raises:
+            TranscodeQueueFullError: 대기열이 가득 찬 경우
+        """
+        return self._run('decode', _decode_job, audio_data, input_format)
+
+    def stats(self):
+        """변환 작업 통계 반환"""
+        with self._stats_lock:
+            finished = self.completed_jobs + self.failed_jobs
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'completed_jobs': self.completed_jobs,
+                'failed_jobs': self.failed_jobs,
+                'rejected_jobs': self.rejected_jobs,
+                'avg_wait_ms': self.total_wait_seconds * 1000 / finished if finished else 0.0,
+                'avg_run_ms': self.total_run_seconds * 1000 / self.completed_jobs if self.completed_jobs else 0.0,
+                'max_run_ms': self.max_run_seconds * 1000
+            }
+
+    def _get_executor(self):
+        """프로세스 풀 반환 (첫 사용 시 또는 이전 풀이 깨진 뒤 생성)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # 멀티스레드/그린 스레드 워커를 그대로 fork하면 잠긴 락 등이 복사되므로
+                    # 단일 스레드 forkserver에서 작업 프로세스를 생성 (없는 플랫폼은 기본 방식)
+                    # forkserver에는 메인 모듈(app.py 등) 대신 변환 작업 모듈만 미리 불러옴
+                    context = None
+                    if 'forkserver' in multiprocessing.get_all_start_methods():
+                        context = multiprocessing.get_context('forkserver')
+                        context.set_forkserver_preload(['services.transcode_service'])
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._executor
+
+    def _discard_executor(self, executor):
+        """깨진 프로세스 풀 폐기 (작업 프로세스가 OOM 등으로 죽으면 이후 작업이 모두 실패하므로 새로 생성)"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+        print("오디오 변환 프로세스 풀이 손상되어 다시 생성합니다.")
+
+    def _submit(self, job, *args):
+        """작업 제출 (풀이 깨져 있으면 한 번 새로 만들어 다시 제출)"""
+        executor = self._get_executor()
+        try:
+            return executor, executor.submit(job, *args)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            return executor, executor.submit(job, *args)
+
+    def _release_slot(self, future):
+        """작업이 실제로 끝났을 때 자리 반환 (대기 시간 초과 후에도 실행 중인 작업은 자리를 유지)"""
+        with self._stats_lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _run(self, operation, job, *args):
+        """작업을 프로세스 풀에 제출하고 결과를 기다림 (대기열이 가득 차면 즉시 거절)"""
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected_jobs += 1
+            raise TranscodeQueueFullError("오디오 변환 대기열이 가득 찼습니다.")
+
+        with self._stats_lock:
+            self.in_flight += 1
+
+        submitted = time.perf_counter()
+        try:
+            executor, future = self._submit(job, *args)
+        except Exception:
+            with self._stats_lock:
+                self.failed_jobs += 1
+            self._release_slot(None)
+            raise
+        future.add_done_callback(self._release_slot)
+
+        try:
+            result, run_seconds = future.result(timeout=self.timeout)
+        except Exception as e:
+            # 아직 대기 중인 작업은 취소 (실행 중인 작업은 끝날 때 자리가 반환됨)
+            future.cancel()
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor(executor)
+            with self._stats_lock:
+                self.failed_jobs += 1
+                self.total_wait_seconds += time.perf_counter() - submitted
+            raise
+
+        # 전체 소요 시간 중 실행 시간을 뺀 나머지를 대기 시간으로 집계
+        elapsed = time.perf_counter() - submitted
+        wait_seconds = max(0.0, elapsed - run_seconds)
+        with self._stats_lock:
+            self.completed_jobs += 1
+            self.total_run_seconds += run_seconds
+            self.total_wait_seconds += wait_seconds
+            self.max_run_seconds = max(self.max_run_seconds, run_seconds)
+        transcode_duration.observe(wait_seconds, operation=operation, phase='wait')
+        transcode_duration.observe(run_seconds, operation=operation, phase='run')
+
+        return result
+
+
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+def get_transcode_service():
+    """프로세스 전체에서 공유하는 오디오 변환 서비스 반환"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_service_lock:
+            if _shared_service is None:
+                _shared_service = TranscodeService()
+    return _shared_service
@@ -0,0 +1,264 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from config import Config
+
+class TTSCache:
+    """TTS 오디오 2단계 캐시 (메모리 LRU + 디스크 저장소)"""
+
+    def __init__(self, cache_dir=None, memory_max_bytes=None, disk_max_bytes=None, ttl=None):
+        """
+        캐시 초기화
+
+        Args:
+            cache_dir (str, optional): 디스크 캐시 디렉토리
+            memory_max_bytes (int, optional): 메모리 캐시 최대 용량 (바이트)
+            disk_max_bytes (int, optional): 디스크 캐시 최대 용량 (바이트)
+            ttl (int, optional): 캐시 유효 시간 (초)
+        """
+        self.cache_dir = cache_dir or Config.TTS_CACHE_DIR
+        self.memory_max_bytes = memory_max_bytes if memory_max_bytes is not None else Config.TTS_CACHE_MEMORY_MAX_BYTES
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else Config.TTS_CACHE_DISK_MAX_BYTES
+        self.ttl = ttl if ttl is not None else Config.TTS_CACHE_TTL
+
+        # 메모리 캐시: key -> (오디오 데이터, 저장 시각)
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None  # 첫 디스크 접근 시 계산
+        self._lock = threading.Lock()
+        self._replace_lock = threading.Lock()  # 같은 키 동시 저장 시 덮어쓴 파일 크기를 정확히 빼기 위함
+        self._evict_lock = threading.Lock()  # 디스크 정리는 한 스레드만 수행
+
+        # 히트/미스 카운터
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_text(text):
+        """캐시 키 계산용 텍스트 정규화 (유니코드 NFC, 공백 정리)"""
+        text = unicodedata.normalize('NFC', text or '')
+        return re.sub(r'\s+', ' ', text).strip()
+
+    @classmethod
+    def make_key(cls, text, reference_id=None, output_format='mp3'):
+        """
+        텍스트, 음성 모델 ID, 출력 형식으로 캐시 키 생성
+
+        Args:
+            text (str): 변환할 텍스트
+            reference_id (str, optional): 음성 모델 ID
+            output_format (str): 출력 오디오 형식
+
+        Returns:
+            str: SHA-256 해시 키
+        """
+        raw = '\x1f'.join([cls.normalize_text(text), reference_id or '', output_format])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        캐시에서 오디오 데이터 조회 (메모리 -> 디스크 순)
+
+        Args:
+            key (str): 캐시 키
+
+        Returns:
+            bytes: 캐시된 오디오 데이터 또는 None
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                audio_data, stored_at = entry
+                if now - stored_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return audio_data
+                # 만료된 항목 제거
+                self._remove_memory(key)
+
+        audio_data, stored_at = self._read_disk(key, now)
+
+        with self._lock:
+            if audio_data is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._put_memory(key, audio_data, stored_at)
+            return audio_data
+
+    def set(self, key, audio_data):
+        """
+        오디오 데이터를 메모리와 디스크 캐시에 저장
+
+        Args:
+            key (str): 캐시 키
+            audio_data (bytes): 저장할 오디오 데이터
+        """
+        if not audio_data:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._put_memory(key, audio_data, now)
+
+        self._write_disk(key, audio_data)
+
+    def stats(self):
+        """캐시 상태 및 히트/미스 통계 반환"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'memory_max_bytes': self.memory_max_bytes,
+                'disk_bytes': self._disk_bytes or 0,
+                'disk_max_bytes': self.disk_max_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+    def _put_memory(self, key, audio_data, stored_at):
+        """메모리 캐시에 저장하고 용량 초과 시 오래된 항목부터 제거 (락 보유 상태에서 호출)"""
+        size = len(audio_data)
+        if size > self.memory_max_bytes:
+            return
+
+        if key in self._memory:
+            self._remove_memory(key)
+
+        self._memory[key] = (audio_data, stored_at)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.memory_max_bytes:
+            oldest_key = next(iter(self._memory))
+            self._remove_memory(oldest_key)
+            self.evictions += 1
+
+    def _remove_memory(self, key):
+        """메모리 캐시 항목 제거 (락 보유 상태에서 호출)"""
+        audio_data, _ = self._memory.pop(key)
+        self._memory_bytes -= len(audio_data)
+
+    def _disk_path(self, key):
+        """캐시 키에 해당하는 디스크 파일 경로"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.bin")
+
+    def _read_disk(self, key, now):
+        """디스크 캐시에서 조회 (만료된 파일은 삭제)"""
+        path = self._disk_path(key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if now - stored_at >= self.ttl:
+                self._delete_disk_file(path)
+                return None, None
+
+            with open(path, 'rb') as f:
+                return f.read(), stored_at
+        except FileNotFoundError:
+            return None, None
+        except Exception as e:
+            print(f"TTS 캐시 읽기 오류: {str(e)}")
+            return None, None
+
+    def _write_disk(self, key, audio_data):
+        """디스크 캐시에 원자적으로 저장 (임시 파일 작성 후 교체)"""
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(audio_data)
+
+            # 같은 키를 덮어쓰면 기존 파일 크기만큼 빼야 전체 용량이 부풀지 않음
+            with self._replace_lock:
+                try:
+                    replaced_bytes = os.path.getsize(path)
+                except FileNotFoundError:
+                    replaced_bytes = 0
+                os.replace(temp_path, path)
+
+            with self._lock:
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_disk_bytes()
+                else:
+                    self._disk_bytes += len(audio_data) - replaced_bytes
+                over_budget = self._disk_bytes > self.disk_max_bytes
+
+            # 다른 스레드가 이미 정리 중이면 기다리지 않고 넘어감
+            if over_budget and self._evict_lock.acquire(blocking=False):
+                try:
+                    self._evict_disk()
+                finally:
+                    self._evict_lock.release()
+
+        except Exception as e:
+            print(f"TTS 캐시 저장 오류: {str(e)}")
+
+    def _scan_disk_files(self):
+        """디스크 캐시 파일 목록 (경로, 크기, 수정 시각)"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.bin'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _scan_disk_bytes(self):
+        """디스크 캐시 전체 용량 계산"""
+        return sum(size for _, size, _ in self._scan_disk_files())
+
+    def _evict_disk(self):
+        """디스크 용량 초과 시 만료 파일과 오래된 파일부터 삭제 (용량의 90%까지, _evict_lock 보유 상태에서 호출)"""
+        now = time.time()
+        entries = sorted(self._scan_disk_files(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * 0.9)
+
+        for path, size, mtime in entries:
+            if total <= target and now - mtime < self.ttl:
+                break
+            self._delete_disk_file(path)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+        with self._lock:
+            self._disk_bytes = total
+
+    def _delete_disk_file(self, path):
+        """디스크 캐시 파일 삭제 (이미 없으면 무시)"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_tts_cache():
+    """프로세스 전체에서 공유하는 TTS 캐시 인스턴스 반환"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = TTSCache()
+    return _shared_cache
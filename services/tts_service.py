@@ -1,8 +1,34 @@
 import os
-import requests
-import json
-import uuid
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, InvalidStateError, FIRST_COMPLETED, wait
 from config import Config
+from services.tts_cache import TTSCache, get_tts_cache
+from utils.text_utils import split_sentences
+from utils.http_client import get_session
+from utils.concurrency import get_bulkhead, ReleasingIterator, UpstreamBusyError
+from utils import tracing
+
+# 문장 단위 합성용 작업 풀 (프로세스 전체에서 공유)
+_pipeline_executor = None
+_pipeline_executor_lock = threading.Lock()
+
+def _get_pipeline_executor():
+    """문장 합성용 공유 스레드 풀 반환"""
+    global _pipeline_executor
+    if _pipeline_executor is None:
+        with _pipeline_executor_lock:
+            if _pipeline_executor is None:
+                _pipeline_executor = ThreadPoolExecutor(
+                    max_workers=Config.TTS_PIPELINE_WORKERS,
+                    thread_name_prefix='tts-pipeline'
+                )
+    return _pipeline_executor
+
+# 일괄 변환 중인 작업 (캐시 키 -> Future, 같은 항목의 중복 합성 방지)
+_batch_pending = {}
+_batch_pending_lock = threading.Lock()
 
 class FishTTSService:
     """Fish TTS API와 통신하는 서비스 클래스"""
@@ -12,59 +38,69 @@ class FishTTSService:
         self.api_key = Config.FISH_TTS_API_KEY
         self.api_url = "https://api.fish-tts.com/v1"  # Fish TTS API URL (예시)
         self.voice_models_dir = Config.VOICE_MODELS_DIR
+        self.output_format = "mp3"
+        # 연결을 재사용하는 공유 HTTP 세션 (타임아웃/재시도 포함)
+        self.session = get_session('fish_tts')
+        # 모델 생성 요청은 중복 생성을 막기 위해 POST 재시도 없이 별도 세션 사용
+        self.upload_session = get_session('fish_tts_upload', retry_methods=('GET', 'HEAD'))
+        # 동일 문장 반복 변환 방지를 위한 오디오 캐시
+        self.cache = get_tts_cache() if Config.TTS_CACHE_ENABLED else None
+        # Fish TTS 동시 요청 수·대기열 제한 및 회로 차단기
+        self.bulkhead = get_bulkhead('fish_tts')
     
-    def create_voice_model(self, user_id, audio_file):
+    @tracing.traced('fish_tts.create_voice_model')
+    def create_voice_model(self, user_id, file_path, model_name=None):
         """
         사용자 음성 파일로부터 새로운 TTS 음성 모델 생성
         
         Args:
             user_id (str): 사용자 ID
-            audio_file (file): 사용자의 음성 샘플 파일
+            file_path (str): 저장된 음성 샘플 파일 경로
+            model_name (str, optional): 모델 이름
             
         Returns:
             dict: 생성된 음성 모델 정보
         """
         try:
-            # 음성 파일 저장 (선택 사항)
-            filename = f"{user_id}_{uuid.uuid4()}.wav"
-            file_path = os.path.join(self.voice_models_dir, filename)
-            audio_file.save(file_path)
-            
             # Fish TTS API 호출하여 음성 모델 생성
+            # (multipart 경계값이 포함된 Content-Type은 requests가 직접 설정)
             headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "multipart/form-data"
+                "Authorization": f"Bearer {self.api_key}"
             }
             
             data = {
                 "user_id": user_id,
-                "model_name": f"{user_id}_voice_model"
-            }
-            
-            files = {
-                'audio_file': (filename, open(file_path, 'rb'), 'audio/wav')
+                "model_name": model_name or f"{user_id}_voice_model"
             }
             
-            response = requests.post(
-                f"{self.api_url}/voice-models",
-                headers=headers,
-                data=data,
-                files=files
-            )
+            with open(file_path, 'rb') as audio:
+                files = {
+                    'audio_file': (os.path.basename(file_path), audio, 'audio/wav')
+                }
+                
+                with self.bulkhead.call() as call:
+                    response = self.upload_session.post(
+                        f"{self.api_url}/voice-models",
+                        headers=headers,
+                        data=data,
+                        files=files
+                    )
+                    if response.status_code >= 500:
+                        call.fail()
             
             if response.status_code == 200:
-                model_info = response.json()
-                # 모델 정보를 로컬에 저장
-                self._save_model_info(user_id, model_info)
-                return model_info
+                return response.json()
             else:
                 print(f"Fish TTS API 오류: {response.text}")
                 return {"error": "음성 모델 생성에 실패했습니다."}
                 
+        except UpstreamBusyError:
+            raise
         except Exception as e:
             print(f"음성 모델 생성 오류: {str(e)}")
             return {"error": str(e)}
     
+    @tracing.traced('fish_tts.text_to_speech')
     def text_to_speech(self, text, reference_id=None):
         """
         텍스트를 음성으로 변환
@@ -77,6 +113,14 @@ class FishTTSService:
             bytes: 생성된 음성 파일 데이터
         """
         try:
+            # 캐시 확인 (같은 텍스트/음성 모델/형식이면 API 호출 생략)
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.make_key(text, reference_id, self.output_format)
+                cached_audio = self.cache.get(cache_key)
+                if cached_audio is not None:
+                    return cached_audio
+            
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
@@ -84,86 +128,412 @@ class FishTTSService:
             
             data = {
                 "text": text,
-                "output_format": "mp3"
+                "output_format": self.output_format
             }
             
             # 음성 모델 ID가 제공된 경우
             if reference_id:
                 data["reference_id"] = reference_id
             
-            response = requests.post(
-                f"{self.api_url}/text-to-speech", 
-                headers=headers,
-                json=data
-            )
+            with self.bulkhead.call() as call:
+                response = self.session.post(
+                    f"{self.api_url}/text-to-speech", 
+                    headers=headers,
+                    json=data
+                )
+                if response.status_code >= 500:
+                    call.fail()
             
             if response.status_code == 200:
+                if cache_key:
+                    self.cache.set(cache_key, response.content)
                 return response.content
             else:
                 print(f"Fish TTS API 오류: {response.text}")
                 return None
                 
+        except UpstreamBusyError:
+            raise
         except Exception as e:
             print(f"TTS 변환 오류: {str(e)}")
             return None
     
-    def list_voice_models(self, user_id=None):
+    def stream_text_to_speech(self, text, reference_id=None):
         """
-        사용자의 음성 모델 목록 조회
+        텍스트를 음성으로 변환하여 청크 단위로 스트리밍
         
         Args:
-            user_id (str, optional): 특정 사용자의 모델만 조회
+            text (str): 음성으로 변환할 텍스트
+            reference_id (str, optional): 사용할 음성 모델의 ID
             
         Returns:
-            list: 음성 모델 목록
+            iterator: 오디오 데이터 청크(bytes) 이터레이터, 실패 시 None
         """
         try:
-            if user_id:
-                # 특정 사용자의 모델만 조회
-                model_path = os.path.join(self.voice_models_dir, f"{user_id}_models.json")
-                if os.path.exists(model_path):
-                    with open(model_path, 'r') as f:
-                        return json.load(f)
-                return []
-            else:
-                # 모든 모델 조회 (Fish TTS API 사용)
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}"
-                }
-                
-                response = requests.get(
-                    f"{self.api_url}/voice-models",
-                    headers=headers
+            # 캐시된 오디오가 있으면 그대로 전달
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.make_key(text, reference_id, self.output_format)
+                cached_audio = self.cache.get(cache_key)
+                if cached_audio is not None:
+                    return iter([cached_audio])
+            
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            data = {
+                "text": text,
+                "output_format": self.output_format
+            }
+            
+            if reference_id:
+                data["reference_id"] = reference_id
+            
+            # 스트림이 끝날 때까지 동시 요청 자리를 유지
+            call = self.bulkhead.call().start()
+            try:
+                # 응답 본문을 한 번에 받지 않고 스트림으로 수신
+                response = self.session.post(
+                    f"{self.api_url}/text-to-speech",
+                    headers=headers,
+                    json=data,
+                    stream=True
                 )
+            except Exception:
+                call.fail()
+                call.finish()
+                raise
+            
+            if response.status_code != 200:
+                print(f"Fish TTS API 오류: {response.text}")
+                response.close()
+                if response.status_code >= 500:
+                    call.fail()
+                call.finish()
+                return None
+            
+            return ReleasingIterator(self._iter_audio_chunks(response, cache_key), call.finish)
+            
+        except UpstreamBusyError:
+            raise
+        except Exception as e:
+            print(f"TTS 스트리밍 오류: {str(e)}")
+            return None
+    
+    def _iter_audio_chunks(self, response, cache_key=None):
+        """스트리밍 응답을 청크 단위로 전달하고, 완료되면 캐시에 저장"""
+        buffer = bytearray() if cache_key else None
+        completed = False
+        
+        try:
+            for chunk in response.iter_content(chunk_size=Config.TTS_STREAM_CHUNK_SIZE):
+                if not chunk:
+                    continue
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Fish TTS API 오류: {response.text}")
-                    return []
+                # 너무 긴 오디오는 캐시하지 않음 (메모리 사용량 유지)
+                if buffer is not None:
+                    if len(buffer) + len(chunk) > Config.TTS_STREAM_CACHE_MAX_BYTES:
+                        buffer = None
+                    else:
+                        buffer.extend(chunk)
                 
+                yield chunk
+            
+            completed = True
+            
         except Exception as e:
-            print(f"모델 목록 조회 오류: {str(e)}")
-            return []
+            # 이미 응답 전송이 시작된 상태이므로 로그만 남기고 스트림 종료
+            print(f"TTS 스트리밍 중단: {str(e)}")
+        finally:
+            response.close()
+            if completed and buffer:
+                self.cache.set(cache_key, bytes(buffer))
+    
+    def text_to_speech_pipeline(self, text, reference_id=None):
+        """
+        긴 텍스트를 문장 단위로 나누어 병렬 합성하고 순서대로 스트리밍
+        
+        Args:
+            text (str): 음성으로 변환할 텍스트
+            reference_id (str, optional): 사용할 음성 모델의 ID
+            
+        Returns:
+            iterator: 문장 순서대로 정렬된 오디오 데이터(bytes) 이터레이터, 텍스트가 비어 있으면 None
+        """
+        sentences = split_sentences(text, max_chars=Config.TTS_PIPELINE_MAX_CHARS)
+        if not sentences:
+            return None
+        
+        return self._iter_pipeline(sentences, reference_id)
     
-    def _save_model_info(self, user_id, model_info):
-        """사용자의 음성 모델 정보를 로컬에 저장"""
+    def submit_sentence(self, sentence, reference_id=None):
+        """
+        문장 하나의 합성 작업을 공유 작업 풀에 제출 (재시도 포함)
+        
+        Args:
+            sentence (str): 음성으로 변환할 문장
+            reference_id (str, optional): 사용할 음성 모델의 ID
+            
+        Returns:
+            Future: 오디오 데이터(bytes) 또는 실패 시 None을 결과로 갖는 Future
+        """
+        return _get_pipeline_executor().submit(tracing.wrap(self._synthesize_sentence), sentence, reference_id)
+    
+    def _iter_pipeline(self, sentences, reference_id):
+        """문장 합성 작업을 제한된 창 크기로 제출하고, 맨 앞 문장이 준비되는 대로 전달"""
+        # 미리 합성해 둘 문장 수 (메모리 사용량 제한)
+        window = Config.TTS_PIPELINE_WORKERS * 2
+        
+        remaining = iter(enumerate(sentences))
+        pending = deque()
+        
+        def submit_next():
+            item = next(remaining, None)
+            if item is not None:
+                index, sentence = item
+                pending.append((index, self.submit_sentence(sentence, reference_id)))
+        
+        for _ in range(window):
+            submit_next()
+        
         try:
-            model_path = os.path.join(self.voice_models_dir, f"{user_id}_models.json")
+            while pending:
+                index, future = pending.popleft()
+                audio_data = future.result()
+                submit_next()
+                
+                if audio_data is None:
+                    # 실패한 문장만 건너뛰고 나머지는 계속 전달
+                    print(f"TTS 파이프라인: {index + 1}번째 문장 합성 실패")
+                    continue
+                
+                yield audio_data
+                
+        finally:
+            # 클라이언트 연결이 끊긴 경우 남은 작업 취소
+            for _, future in pending:
+                future.cancel()
+    
+    def text_to_speech_batch(self, items, background=False):
+        """
+        여러 텍스트를 음성으로 변환 (같은 텍스트/음성 모델 항목은 요청 간에도 한 번만 합성)
+        
+        공유 작업 풀을 대화형 요청과 나눠 쓰므로 요청 하나가 동시에 합성하는 항목 수는
+        TTS_BATCH_WINDOW개로 제한하고, 하나가 끝날 때마다 다음 항목을 제출
+        
+        Args:
+            items (list): {'text': str, 'reference_id': str(선택)} 딕셔너리 리스트
+            background (bool): True면 백그라운드 스레드에서 합성을 진행하고 이터레이터 대신 None 반환
             
-            # 기존 모델 정보 로드 또는 새로 생성
-            if os.path.exists(model_path):
-                with open(model_path, 'r') as f:
-                    models = json.load(f)
-            else:
-                models = []
+        Returns:
+            tuple: (항목 순서대로의 캐시 키 리스트,
+                    완료 순서대로 (캐시 키, 오디오 데이터 또는 None)을 내보내는 이터레이터)
+        """
+        keys = [TTSCache.make_key(item['text'], item.get('reference_id'), self.output_format)
+                for item in items]
+        
+        # 아직 제출하지 않은 항목도 진행 중으로 등록 (다른 요청의 중복 제거와 결과 조회용)
+        subscriptions = {}
+        for key, item in zip(keys, items):
+            if key not in subscriptions:
+                subscriptions[key] = self._subscribe_batch_item(key, item['text'], item.get('reference_id'))
+        
+        results = ReleasingIterator(
+            self._iter_batch(subscriptions),
+            lambda: self._unsubscribe_batch_items(subscriptions)
+        )
+        
+        if background:
+            threading.Thread(target=self._drain_batch, args=(results,), daemon=True).start()
+            return keys, None
+        return keys, results
+    
+    def get_batch_result(self, cache_key):
+        """
+        일괄 변환 결과 조회
+        
+        Args:
+            cache_key (str): text_to_speech_batch가 반환한 캐시 키
             
-            # 새 모델 정보 추가
-            models.append(model_info)
+        Returns:
+            tuple: (상태 'ready'/'processing'/'missing', 오디오 데이터 또는 None)
+        """
+        if self.cache:
+            audio_data = self.cache.get(cache_key)
+            if audio_data is not None:
+                return 'ready', audio_data
+        
+        with _batch_pending_lock:
+            future = _batch_pending.get(cache_key)
+        if future is not None and not future.done():
+            return 'processing', None
+        return 'missing', None
+    
+    def _subscribe_batch_item(self, cache_key, text, reference_id):
+        """
+        항목 하나의 결과 Future 구독 (캐시에 있으면 완료된 Future, 진행/대기 중이면 기존 Future 공유)
+        
+        Returns:
+            Future: 오디오 데이터(bytes) 또는 실패 시 None을 결과로 갖는 Future
+        """
+        if self.cache:
+            cached_audio = self.cache.get(cache_key)
+            if cached_audio is not None:
+                future = Future()
+                future.set_result(cached_audio)
+                return future
+        
+        with _batch_pending_lock:
+            future = _batch_pending.get(cache_key)
+            if future is not None:
+                future.subscribers += 1
+                return future
             
-            # 저장
-            with open(model_path, 'w') as f:
-                json.dump(models, f, indent=2)
+            # 실제 합성은 _start_batch_item에서 제출 (구독한 요청이 모두 떠나면 취소)
+            future = Future()
+            future.subscribers = 1
+            future.job = None
+            future.batch_args = (text, reference_id)
+            _batch_pending[cache_key] = future
+        
+        def forget(done_future):
+            with _batch_pending_lock:
+                if _batch_pending.get(cache_key) is done_future:
+                    del _batch_pending[cache_key]
+        
+        future.add_done_callback(forget)
+        return future
+    
+    def _start_batch_item(self, future):
+        """구독한 항목의 합성 작업을 제출 (이미 제출되었거나 완료/취소되었으면 무시)"""
+        with _batch_pending_lock:
+            if future.done() or future.job is not None:
+                return
+            text, reference_id = future.batch_args
+            future.job = self.submit_sentence(text, reference_id)
+        
+        def relay(job):
+            # 구독이 모두 해제되어 취소된 경우에는 결과를 버림
+            try:
+                if job.cancelled():
+                    future.cancel()
+                elif job.exception() is not None:
+                    future.set_exception(job.exception())
+                else:
+                    future.set_result(job.result())
+            except InvalidStateError:
+                pass
+        
+        future.job.add_done_callback(relay)
+    
+    def _unsubscribe_batch_items(self, subscriptions):
+        """
+        남은 구독 해제 (다른 요청이 구독 중이 아닌 미완료 항목만 취소)
+        
+        구독 수 확인과 대기 목록 제거를 같은 락 안에서 처리하여
+        다른 요청이 그 사이에 같은 항목을 구독했다가 취소된 결과를 받는 일이 없도록 함
+        (취소는 완료 콜백이 같은 락을 잡으므로 락 밖에서 실행, 이미 목록에서 빠져 새 구독은 없음)
+        """
+        abandoned = []
+        with _batch_pending_lock:
+            for key, future in subscriptions.items():
+                if getattr(future, 'subscribers', None) is None:
+                    continue
+                future.subscribers -= 1
+                if future.subscribers > 0 or future.done():
+                    continue
+                if _batch_pending.get(key) is future:
+                    del _batch_pending[key]
+                abandoned.append(future)
+            subscriptions.clear()
+        
+        for future in abandoned:
+            if future.job is not None:
+                future.job.cancel()
+            future.cancel()
+    
+    def _iter_batch(self, subscriptions):
+        """합성이 끝난 항목부터 (캐시 키, 오디오 데이터) 전달 (동시에 제출하는 항목 수 제한)"""
+        remaining = deque(subscriptions.items())
+        in_flight = {}
+        
+        def fill_window():
+            while remaining and len(in_flight) < Config.TTS_BATCH_WINDOW:
+                key, future = remaining.popleft()
+                self._start_batch_item(future)
+                in_flight[future] = key
+        
+        fill_window()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = in_flight.pop(future)
+                # 구독 중인 Future는 취소되지 않지만 방어적으로 실패로 처리
+                audio_data = None if future.cancelled() else future.result()
+                self._unsubscribe_batch_items({key: subscriptions.pop(key)})
+                yield key, audio_data
+            fill_window()
+    
+    @staticmethod
+    def _drain_batch(results):
+        """백그라운드 일괄 변환 실행 (결과는 캐시에 저장되어 get_batch_result로 조회)"""
+        try:
+            for _ in results:
+                pass
+        except Exception as e:
+            print(f"백그라운드 일괄 TTS 변환 오류: {str(e)}")
+        finally:
+            results.close()
+    
+    @tracing.traced('fish_tts.synthesize_sentence')
+    def _synthesize_sentence(self, sentence, reference_id):
+        """문장 하나를 합성 (실패 시 지수 백오프로 재시도)"""
+        for attempt in range(Config.TTS_PIPELINE_RETRIES + 1):
+            try:
+                audio_data = self.text_to_speech(sentence, reference_id)
+            except UpstreamBusyError:
+                # 동시 요청 한도 초과도 일시적 실패로 보고 재시도
+                audio_data = None
+            if audio_data:
+                return audio_data
+            
+            if attempt < Config.TTS_PIPELINE_RETRIES:
+                time.sleep(Config.TTS_PIPELINE_RETRY_BACKOFF * (2 ** attempt))
+        
+        return None
+    
+    @tracing.traced('fish_tts.list_voice_models')
+    def list_voice_models(self):
+        """
+        Fish TTS에 등록된 전체 음성 모델 목록 조회
+        (사용자별 모델 목록은 VoiceModelService.list_voice_models 사용)
+        
+        Returns:
+            list: 음성 모델 목록, 실패 시 None
+        """
+        try:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}"
+            }
+            
+            with self.bulkhead.call() as call:
+                response = self.session.get(
+                    f"{self.api_url}/voice-models",
+                    headers=headers
+                )
+                if response.status_code >= 500:
+                    call.fail()
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"Fish TTS API 오류: {response.text}")
+                return None
                 
+        except UpstreamBusyError:
+            raise
         except Exception as e:
-            print(f"모델 정보 저장 오류: {str(e)}")
\ No newline at end of file
+            print(f"모델 목록 조회 오류: {str(e)}")
+            return None
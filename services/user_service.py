@@ -1,5 +1,26 @@
 from models import db
 from models.user import User
+from config import Config
+from utils.cache_utils import TTLCache
+from utils.password_hasher import PasswordHasherBusyError
+
+# 사용자 ID -> 사용자 정보 딕셔너리 캐시 (프로필 조회용, 수정/삭제 시 무효화)
+_user_cache = TTLCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+
+def get_user_cache_stats():
+    """사용자 정보 캐시 사용 통계 반환"""
+    return _user_cache.stats()
+
+def _find_by_login_key(username, email):
+    """
+    사용자명 또는 이메일이 일치하는 사용자 조회
+    
+    OR 조건은 MariaDB에서 두 인덱스를 함께 쓰지 못해 전체 스캔이 되기 쉬우므로
+    각 인덱스를 사용하는 두 조회를 UNION으로 합침
+    """
+    return User.query.filter(User.username == username).union(
+        User.query.filter(User.email == email)
+    )
 
 class UserService:
     """사용자 관련 비즈니스 로직 처리 서비스"""
@@ -18,12 +39,10 @@ class UserService:
         """
         try:
             # 이미 존재하는 사용자 확인
-            existing_user = User.query.filter(
-                (User.username == username) | (User.email == email)
-            ).first()
+            existing_users = _find_by_login_key(username, email).all()
             
-            if existing_user:
-                if existing_user.username == username:
+            if existing_users:
+                if any(user.username == username for user in existing_users):
                     return {'error': '이미 사용 중인 사용자명입니다.'}
                 else:
                     return {'error': '이미 사용 중인 이메일입니다.'}
@@ -35,6 +54,9 @@ class UserService:
             
             return new_user
             
+        except PasswordHasherBusyError:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             print(f"사용자 생성 오류: {str(e)}")
@@ -52,6 +74,25 @@ class UserService:
         """
         return User.query.get(user_id)
     
+    def get_user_profile(self, user_id):
+        """
+        사용자 정보 조회 (캐시 우선, 없으면 DB 조회 후 캐시에 저장)
+        
+        Args:
+            user_id (int): 사용자 ID
+            
+        Returns:
+            dict: 사용자 정보 딕셔너리 또는 None
+        """
+        profile = _user_cache.get(user_id)
+        if profile is None:
+            user = User.query.get(user_id)
+            if not user:
+                return None
+            profile = user.to_dict()
+            _user_cache.set(user_id, profile)
+        return profile
+    
     def get_user_by_username(self, username):
         """
         사용자명으로 사용자 조회
@@ -88,14 +129,23 @@ class UserService:
             User: 인증 성공 시 사용자 객체, 실패 시 None
         """
         # 이메일 또는 사용자명으로 사용자 조회
-        user = User.query.filter(
-            (User.username == username_or_email) | (User.email == username_or_email)
-        ).first()
+        user = _find_by_login_key(username_or_email, username_or_email).first()
         
         # 사용자가 존재하고 비밀번호가 일치하는지 확인
-        if user and user.check_password(password):
-            return user
-        return None
+        if not user or not user.check_password(password):
+            return None
+        
+        # 해시 설정이 바뀌었으면 평문 비밀번호를 알고 있는 지금 새 설정으로 다시 저장
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except Exception as e:
+                # 다시 해시하지 못해도 로그인은 성공 처리 (다음 로그인 때 재시도)
+                db.session.rollback()
+                print(f"비밀번호 재해시 오류: {str(e)}")
+        
+        return user
     
     def update_user(self, user_id, data):
         """
@@ -124,8 +174,12 @@ class UserService:
                 user.set_password(data['password'])
             
             db.session.commit()
+            _user_cache.delete(user_id)
             return user
             
+        except PasswordHasherBusyError:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             print(f"사용자 업데이트 오류: {str(e)}")
@@ -148,6 +202,7 @@ class UserService:
             
             db.session.delete(user)
             db.session.commit()
+            _user_cache.delete(user_id)
             return True
             
         except Exception as e:
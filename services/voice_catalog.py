@@ -0,0 +1,211 @@
+import base64
+import bisect
+import hashlib
+import json
+import threading
+import time
+from config import Config
+
+class CatalogUnavailableError(Exception):
+    """캐시된 목록이 없고 Fish TTS에서도 목록을 가져오지 못했을 때 발생"""
+
+
+class VoiceCatalog:
+    """Fish TTS 전체 음성 모델 목록 캐시 (만료 후에는 이전 목록을 제공하면서 백그라운드에서 갱신)"""
+
+    def __init__(self, fetch, ttl=None, stale_ttl=None):
+        """
+        카탈로그 초기화
+
+        Args:
+            fetch (callable): 전체 모델 목록을 반환하는 함수 (실패 시 None)
+            ttl (float, optional): 목록을 새것으로 보는 시간 (초)
+            stale_ttl (float, optional): 만료된 목록을 갱신 중에 계속 제공할 최대 시간 (초)
+        """
+        self.fetch = fetch
+        self.ttl = ttl or Config.VOICE_CATALOG_TTL
+        self.stale_ttl = stale_ttl or Config.VOICE_CATALOG_STALE_TTL
+
+        self._models = None  # 정렬 키 순으로 정렬된 모델 리스트
+        self._keys = []  # _models와 같은 순서의 고유 정렬 키 (커서 검색용)
+        self._etag = None
+        self._fetched_at = 0.0
+
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()  # 동시에 하나의 요청만 업스트림 조회
+        self._refreshing = False
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @staticmethod
+    def model_key(model):
+        """정렬에 사용할 모델 ID (없으면 빈 문자열, 중복 가능)"""
+        return str(model.get('reference_id') or model.get('id') or model.get('_id') or '')
+
+    @staticmethod
+    def _unique_keys(models):
+        """
+        모델을 정렬하고 커서에 사용할 고유 키 생성
+
+        모델 ID가 없거나 겹치는 모델은 내용 해시로, 내용까지 같은 모델은 순번으로 구분
+        (구분자 \\x00은 가장 작은 문자이므로 문자열 비교 순서가 (ID, 해시, 순번) 순서와 같음)
+
+        Args:
+            models (list): 모델 dict 리스트
+
+        Returns:
+            tuple: (정렬된 모델 리스트, 같은 순서의 고유 키 리스트)
+        """
+        entries = []
+        for model in models:
+            raw = json.dumps(model, sort_keys=True, ensure_ascii=False).encode('utf-8')
+            entries.append((VoiceCatalog.model_key(model), hashlib.sha256(raw).hexdigest()[:16], model))
+        entries.sort(key=lambda entry: entry[:2])
+
+        keys = []
+        previous = None
+        occurrence = 0
+        for model_id, digest, _ in entries:
+            base = f"{model_id}\x00{digest}"
+            occurrence = occurrence + 1 if base == previous else 0
+            previous = base
+            keys.append(f"{base}\x00{occurrence:06d}")
+        return [model for _, _, model in entries], keys
+
+    def get_page(self, cursor=None, limit=None):
+        """
+        목록의 한 페이지 조회
+
+        Args:
+            cursor (str, optional): 이전 페이지 응답의 next_cursor
+            limit (int, optional): 페이지당 항목 수
+
+        Returns:
+            dict: {'models', 'next_cursor', 'total', 'etag'}
+
+        Raises:
+            ValueError: 커서 형식이 잘못된 경우
+            CatalogUnavailableError: 목록을 가져올 수 없는 경우
+        """
+        limit = max(1, min(limit or Config.VOICE_MODEL_PAGE_SIZE, Config.VOICE_MODEL_MAX_PAGE_SIZE))
+        after = self._decode_cursor(cursor) if cursor else None
+
+        models, keys, etag = self._get_snapshot()
+
+        # 커서는 마지막으로 받은 모델의 키이므로 목록이 갱신되어도 위치가 유지됨
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        page = models[start:start + limit]
+        next_cursor = None
+        if start + limit < len(models):
+            next_cursor = self._encode_cursor(keys[start + limit - 1])
+
+        return {
+            'models': page,
+            'next_cursor': next_cursor,
+            'total': len(models),
+            'etag': etag
+        }
+
+    def stats(self):
+        """캐시 상태 반환"""
+        with self._lock:
+            return {
+                'entries': len(self._models) if self._models is not None else 0,
+                'age_seconds': time.monotonic() - self._fetched_at if self._models is not None else None,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures
+            }
+
+    def _get_snapshot(self):
+        """현재 목록 반환 (만료되었으면 갱신 또는 백그라운드 갱신 시작)"""
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if self._models is not None and age < self.ttl:
+                self.hits += 1
+                return self._models, self._keys, self._etag
+
+            if self._models is not None and age < self.stale_ttl:
+                # 오래된 목록을 바로 반환하고 갱신은 한 번만 백그라운드에서 실행
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh_in_background, daemon=True).start()
+                return self._models, self._keys, self._etag
+
+        # 목록이 없거나 너무 오래된 경우 직접 갱신 (동시 요청은 한 번의 조회 결과를 공유)
+        with self._fetch_lock:
+            with self._lock:
+                if self._models is not None and time.monotonic() - self._fetched_at < self.ttl:
+                    return self._models, self._keys, self._etag
+            self._refresh()
+
+        with self._lock:
+            if self._models is None:
+                raise CatalogUnavailableError("음성 모델 목록을 가져올 수 없습니다.")
+            return self._models, self._keys, self._etag
+
+    def _refresh_in_background(self):
+        """백그라운드 갱신 스레드 본문"""
+        try:
+            with self._fetch_lock:
+                self._refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _refresh(self):
+        """업스트림에서 목록을 가져와 교체 (실패 시 기존 목록 유지, _fetch_lock 보유 상태에서 호출)"""
+        try:
+            models = self.fetch()
+        except Exception as e:
+            print(f"음성 모델 목록 갱신 오류: {str(e)}")
+            models = None
+
+        if models is None:
+            with self._lock:
+                self.refresh_failures += 1
+            return
+
+        models, keys = self._unique_keys(models)
+        raw = json.dumps(models, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        etag = hashlib.sha256(raw).hexdigest()[:32]
+
+        with self._lock:
+            self._models, self._keys, self._etag = models, keys, etag
+            self._fetched_at = time.monotonic()
+            self.refreshes += 1
+
+    @staticmethod
+    def _encode_cursor(key):
+        return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            return base64.b64decode(padded.encode('ascii'), altchars=b'-_', validate=True).decode('utf-8')
+        except Exception:
+            raise ValueError("잘못된 커서입니다.")
+
+
+_shared_catalog = None
+_shared_catalog_lock = threading.Lock()
+
+def get_voice_catalog(fetch):
+    """
+    프로세스 전체에서 공유하는 음성 모델 카탈로그 반환
+
+    Args:
+        fetch (callable): 처음 생성할 때 사용할 목록 조회 함수
+    """
+    global _shared_catalog
+    if _shared_catalog is None:
+        with _shared_catalog_lock:
+            if _shared_catalog is None:
+                _shared_catalog = VoiceCatalog(fetch)
+    return _shared_catalog
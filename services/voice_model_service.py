@@ -1,8 +1,52 @@
 from models import db
 from models.voice_model import VoiceModel
 import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
 from config import Config
+from utils.cache_utils import TTLCache
+from utils.concurrency import UpstreamBusyError
+from utils import tracing
+
+# 음성 모델 생성 작업 풀 (프로세스 전체에서 공유)
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+def _get_job_executor():
+    """음성 모델 생성용 공유 스레드 풀 반환"""
+    global _job_executor
+    if _job_executor is None:
+        with _job_executor_lock:
+            if _job_executor is None:
+                _job_executor = ThreadPoolExecutor(
+                    max_workers=Config.VOICE_MODEL_JOB_WORKERS,
+                    thread_name_prefix='voice-model-job'
+                )
+    return _job_executor
+
+# 이 프로세스에서 대기/실행 중인 작업 ID (주기적으로 updated_at을 갱신해 다른 워커가 다시 가져가지 않도록 함)
+_owned_jobs = set()
+_owned_jobs_lock = threading.Lock()
+_monitor_pid = None
+
+# 사용자별 음성 모델 목록 캐시 ((사용자 ID, 상태) -> 모델 딕셔너리 리스트, 쓰기 시 무효화)
+_model_cache = TTLCache(maxsize=Config.VOICE_MODEL_CACHE_SIZE, ttl=Config.VOICE_MODEL_CACHE_TTL)
+
+# 목록 조회 대상 상태 (캐시 무효화 시 함께 제거)
+LISTABLE_STATUSES = ('processing', 'active', 'failed')
+
+def invalidate_user_models(user_id):
+    """사용자의 음성 모델 목록 캐시 제거 (모델 생성/수정/삭제 후 호출)"""
+    for status in LISTABLE_STATUSES:
+        _model_cache.delete((user_id, status))
+
+def get_model_cache_stats():
+    """음성 모델 목록 캐시 사용 통계 반환"""
+    return _model_cache.stats()
 
 class VoiceModelService:
     """음성 모델 관련 비즈니스 로직 처리 서비스"""
@@ -19,7 +63,7 @@ class VoiceModelService:
     
     def create_voice_model(self, user_id, model_name, audio_file, description=None):
         """
-        새 음성 모델 생성
+        새 음성 모델 생성 요청 (파일 저장과 DB 기록 후 Fish TTS 모델 생성은 백그라운드 작업으로 실행)
         
         Args:
             user_id (int): 사용자 ID
@@ -28,7 +72,7 @@ class VoiceModelService:
             description (str, optional): 모델 설명
             
         Returns:
-            VoiceModel: 생성된 음성 모델 객체 또는 오류
+            VoiceModel: 'processing' 상태의 음성 모델 객체 (id가 작업 ID) 또는 오류
         """
         try:
             # 파일 저장 경로 생성
@@ -40,29 +84,21 @@ class VoiceModelService:
             # 오디오 파일 저장
             audio_file.save(file_path)
             
-            # Fish TTS API를 통해 모델 생성
-            if self.fish_tts_service:
-                model_info = self.fish_tts_service.create_voice_model(user_id, audio_file)
-                if 'error' in model_info:
-                    return model_info
-                
-                reference_id = model_info.get('reference_id')
-            else:
-                # 테스트용 임시 ID (실제로는 Fish TTS API에서 받아야 함)
-                reference_id = f"fish_tts_{uuid.uuid4()}"
-            
-            # DB에 모델 정보 저장
+            # 작업 상태를 DB에 기록 (reference_id는 모델 생성 완료 후 실제 값으로 교체)
             voice_model = VoiceModel(
                 user_id=user_id,
                 model_name=model_name,
-                reference_id=reference_id,
+                reference_id=f"pending_{uuid.uuid4()}",
                 file_path=file_path,
                 description=description
             )
+            voice_model.status = 'processing'
             
             db.session.add(voice_model)
             db.session.commit()
+            invalidate_user_models(user_id)
             
+            self._submit_job(voice_model.id)
             return voice_model
             
         except Exception as e:
@@ -70,6 +106,162 @@ class VoiceModelService:
             print(f"음성 모델 생성 오류: {str(e)}")
             return {'error': '음성 모델 생성 중 오류가 발생했습니다.'}
     
+    def resume_stalled_jobs(self):
+        """
+        서버 재시작 등으로 중단된 음성 모델 생성 작업을 다시 대기열에 넣음
+        
+        VOICE_MODEL_JOB_STALE_AFTER 동안 갱신되지 않은 'processing' 모델만 대상으로 하며,
+        updated_at을 조건부로 갱신해 여러 워커 프로세스 중 한 곳에서만 재시작되도록 함
+        
+        Returns:
+            int: 다시 대기열에 넣은 작업 수
+        """
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=Config.VOICE_MODEL_JOB_STALE_AFTER)
+            stalled = VoiceModel.query.filter(
+                VoiceModel.status == 'processing',
+                VoiceModel.updated_at < cutoff
+            ).all()
+            
+            with _owned_jobs_lock:
+                owned = set(_owned_jobs)
+            
+            resumed = 0
+            for model in stalled:
+                if model.id in owned:
+                    continue
+
+                claimed = VoiceModel.query.filter(
+                    VoiceModel.id == model.id,
+                    VoiceModel.status == 'processing',
+                    VoiceModel.updated_at == model.updated_at
+                ).update({'updated_at': datetime.utcnow()}, synchronize_session=False)
+                db.session.commit()
+                
+                if claimed:
+                    self._submit_job(model.id)
+                    resumed += 1
+            
+            return resumed
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"음성 모델 작업 재시작 오류: {str(e)}")
+            return 0
+    
+    def heartbeat_jobs(self):
+        """
+        이 프로세스가 맡은 작업의 updated_at 갱신 (대기열에서 기다리거나 재시도 중인 작업 포함)
+        
+        Returns:
+            int: 갱신한 작업 수
+        """
+        with _owned_jobs_lock:
+            job_ids = list(_owned_jobs)
+        if not job_ids:
+            return 0
+        
+        try:
+            updated = VoiceModel.query.filter(
+                VoiceModel.id.in_(job_ids),
+                VoiceModel.status == 'processing'
+            ).update({'updated_at': datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+            return updated
+        except Exception as e:
+            db.session.rollback()
+            print(f"음성 모델 작업 상태 갱신 오류: {str(e)}")
+            return 0
+    
+    def start_job_monitor(self, app):
+        """
+        작업 상태 갱신과 중단된 작업 재실행을 주기적으로 수행하는 백그라운드 스레드 시작
+        (워커 프로세스마다 한 번, fork 이후에 호출)
+        
+        Args:
+            app: Flask 애플리케이션 인스턴스
+        """
+        global _monitor_pid
+        with _owned_jobs_lock:
+            if _monitor_pid == os.getpid():
+                return
+            _monitor_pid = os.getpid()
+        threading.Thread(target=self._monitor_jobs, args=(app,), daemon=True,
+                         name='voice-model-job-monitor').start()
+    
+    def _monitor_jobs(self, app):
+        """작업 감시 스레드 본문"""
+        next_rescan = time.monotonic() + Config.VOICE_MODEL_JOB_RESCAN_INTERVAL
+        while True:
+            time.sleep(Config.VOICE_MODEL_JOB_HEARTBEAT)
+            with app.app_context():
+                try:
+                    self.heartbeat_jobs()
+                    if time.monotonic() >= next_rescan:
+                        next_rescan = time.monotonic() + Config.VOICE_MODEL_JOB_RESCAN_INTERVAL
+                        self.resume_stalled_jobs()
+                finally:
+                    db.session.remove()
+    
+    def _submit_job(self, model_id):
+        """모델 생성 작업을 작업 풀에 제출 (작업 스레드에서 사용할 앱 객체를 함께 전달)"""
+        app = current_app._get_current_object()
+        with _owned_jobs_lock:
+            _owned_jobs.add(model_id)
+        _get_job_executor().submit(tracing.wrap(self._run_job), app, model_id)
+    
+    def _run_job(self, app, model_id):
+        """작업 스레드에서 Fish TTS 모델 생성을 실행하고 결과를 DB에 반영"""
+        with app.app_context():
+            try:
+                model = VoiceModel.query.get(model_id)
+                if not model or model.status != 'processing':
+                    return
+                user_id, file_path, model_name = model.user_id, model.file_path, model.model_name
+                
+                # 수 초 이상 걸리는 업로드 동안 DB 연결을 붙잡지 않도록 트랜잭션을 먼저 종료
+                db.session.commit()
+                model_info = self._request_fish_model(user_id, file_path, model_name)
+                
+                model = VoiceModel.query.get(model_id)
+                if not model or model.status != 'processing':
+                    return
+                
+                if model_info is None or 'error' in model_info or not model_info.get('reference_id'):
+                    model.status = 'failed'
+                else:
+                    model.reference_id = model_info['reference_id']
+                    model.status = 'active'
+                
+                db.session.commit()
+                invalidate_user_models(user_id)
+                
+            except Exception as e:
+                db.session.rollback()
+                print(f"음성 모델 생성 작업 오류 (모델 ID {model_id}): {str(e)}")
+                VoiceModel.query.filter_by(id=model_id, status='processing').update({'status': 'failed'})
+                db.session.commit()
+                _model_cache.clear()
+            finally:
+                with _owned_jobs_lock:
+                    _owned_jobs.discard(model_id)
+                db.session.remove()
+    
+    def _request_fish_model(self, user_id, file_path, model_name):
+        """Fish TTS API로 모델 생성 (요청이 몰려 거절되면 지수 백오프로 재시도)"""
+        if not self.fish_tts_service:
+            # 테스트용 임시 ID (실제로는 Fish TTS API에서 받아야 함)
+            return {'reference_id': f"fish_tts_{uuid.uuid4()}"}
+        
+        for attempt in range(Config.VOICE_MODEL_JOB_RETRIES + 1):
+            try:
+                return self.fish_tts_service.create_voice_model(user_id, file_path, model_name)
+            except UpstreamBusyError:
+                if attempt < Config.VOICE_MODEL_JOB_RETRIES:
+                    time.sleep(Config.VOICE_MODEL_JOB_RETRY_BACKOFF * (2 ** attempt))
+        
+        return None
+    
     def get_model_by_id(self, model_id):
         """
         ID로 음성 모델 조회
@@ -82,17 +274,52 @@ class VoiceModelService:
         """
         return VoiceModel.query.get(model_id)
     
-    def get_models_by_user(self, user_id):
+    def get_models_by_user(self, user_id, status='active'):
+        """
+        사용자의 음성 모델 조회 (캐시 우선, 없으면 (user_id, status) 인덱스로 조회 후 캐시에 저장)
+        
+        Args:
+            user_id (int): 사용자 ID
+            status (str): 조회할 모델 상태
+            
+        Returns:
+            list: 음성 모델 딕셔너리 리스트 (최신순)
+        """
+        cache_key = (user_id, status)
+        models = _model_cache.get(cache_key)
+        if models is None:
+            rows = (VoiceModel.query
+                    .filter_by(user_id=user_id, status=status)
+                    .order_by(VoiceModel.id.desc())
+                    .all())
+            models = [model.to_dict() for model in rows]
+            _model_cache.set(cache_key, models)
+        return models
+    
+    def list_voice_models(self, user_id, status='active', page=1, per_page=None):
         """
-        사용자의 모든 음성 모델 조회
+        사용자의 음성 모델 목록을 페이지 단위로 조회
         
         Args:
             user_id (int): 사용자 ID
+            status (str): 조회할 모델 상태
+            page (int): 페이지 번호 (1부터 시작)
+            per_page (int, optional): 페이지당 항목 수
             
         Returns:
-            list: 음성 모델 객체 리스트
+            dict: 모델 목록과 페이지 정보
         """
-        return VoiceModel.query.filter_by(user_id=user_id, status='active').all()
+        per_page = max(1, min(per_page or Config.VOICE_MODEL_PAGE_SIZE, Config.VOICE_MODEL_MAX_PAGE_SIZE))
+        page = max(1, page)
+        
+        models = self.get_models_by_user(user_id, status)
+        start = (page - 1) * per_page
+        return {
+            'models': models[start:start + per_page],
+            'page': page,
+            'per_page': per_page,
+            'total': len(models)
+        }
     
     def update_model(self, model_id, data):
         """
@@ -117,6 +344,7 @@ class VoiceModelService:
                     setattr(model, field, data[field])
             
             db.session.commit()
+            invalidate_user_models(model.user_id)
             return model
             
         except Exception as e:
@@ -142,6 +370,7 @@ class VoiceModelService:
             # 소프트 삭제 (상태만 변경)
             model.status = 'deleted'
             db.session.commit()
+            invalidate_user_models(model.user_id)
             
             return True
             
@@ -170,8 +399,10 @@ class VoiceModelService:
                 os.remove(model.file_path)
             
             # DB에서 레코드 삭제
+            user_id = model.user_id
             db.session.delete(model)
             db.session.commit()
+            invalidate_user_models(user_id)
             
             return True
             
@@ -0,0 +1,81 @@
+import math
+import sys
+from array import array
+
+def pcm_rms(pcm_data, sample_width=2):
+    """
+    PCM 오디오 데이터의 RMS 에너지 계산
+
+    Args:
+        pcm_data (bytes): 리틀 엔디언 PCM 데이터
+        sample_width (int): 샘플 크기 (바이트, 16비트 = 2)
+
+    Returns:
+        float: RMS 값 (SpeechRecognition의 energy_threshold와 같은 척도)
+    """
+    if sample_width != 2:
+        raise ValueError("16비트 PCM만 지원합니다.")
+
+    usable = len(pcm_data) - (len(pcm_data) % sample_width)
+    if usable <= 0:
+        return 0.0
+
+    samples = array('h')
+    samples.frombytes(bytes(pcm_data[:usable]))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+def pcm_duration(byte_count, sample_rate=16000, sample_width=2):
+    """PCM 데이터 길이(바이트)를 재생 시간(초)으로 변환"""
+    return byte_count / float(sample_rate * sample_width)
+
+class SegmentBuffer:
+    """미리 할당한 고정 크기 세그먼트에 PCM 데이터를 이어 붙이는 버퍼 (재할당/복사 최소화)"""
+
+    def __init__(self, segment_size=64 * 1024):
+        """
+        버퍼 초기화
+
+        Args:
+            segment_size (int): 세그먼트 하나의 크기 (바이트)
+        """
+        self.segment_size = segment_size
+        self._segments = []
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def allocated_bytes(self):
+        """실제로 할당된 메모리 크기 (바이트)"""
+        return len(self._segments) * self.segment_size
+
+    def extend(self, data):
+        """데이터를 버퍼 끝에 추가"""
+        view = memoryview(data)
+        while len(view):
+            offset = self._length % self.segment_size
+            if offset == 0 and self._length == len(self._segments) * self.segment_size:
+                self._segments.append(bytearray(self.segment_size))
+
+            count = min(len(view), self.segment_size - offset)
+            self._segments[-1][offset:offset + count] = view[:count]
+            view = view[count:]
+            self._length += count
+
+    def getvalue(self):
+        """버퍼 내용 전체를 bytes로 반환"""
+        result = bytearray(self._length)
+        position = 0
+        for segment in self._segments:
+            count = min(self.segment_size, self._length - position)
+            result[position:position + count] = memoryview(segment)[:count]
+            position += count
+        return bytes(result)
+
+    def clear(self):
+        """버퍼를 비우고 세그먼트 메모리 해제"""
+        self._segments = []
+        self._length = 0
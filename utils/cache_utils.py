@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """유효 시간과 최대 항목 수를 갖는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        """
+        캐시 초기화
+
+        Args:
+            maxsize (int): 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl (float): 항목 유효 시간 (초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (값, 만료 시각)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """캐시 조회 (없거나 만료되었으면 default 반환)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """캐시에 값 저장"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """캐시 항목 제거"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and time.monotonic() < entry[1]
+
+    def stats(self):
+        """캐시 사용 통계 반환"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,347 @@
+import threading
+import time
+from config import Config
+from utils import tracing
+from utils.metrics import upstream_request_duration
+
+class UpstreamBusyError(Exception):
+    """외부 API(업스트림)가 요청을 받을 수 없는 상태일 때 발생하는 예외의 기본 클래스"""
+
+
+class BulkheadFullError(UpstreamBusyError):
+    """업스트림의 동시 요청과 대기열이 모두 가득 찼을 때 발생"""
+
+
+class CircuitOpenError(UpstreamBusyError):
+    """연속된 오류로 회로 차단기가 열려 요청을 즉시 거절할 때 발생"""
+
+
+class CircuitBreaker:
+    """연속 실패 횟수가 임계값을 넘으면 일정 시간 동안 요청을 차단하는 회로 차단기"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        """
+        회로 차단기 초기화
+
+        Args:
+            failure_threshold (int, optional): 차단기를 열 연속 실패 횟수
+            reset_timeout (float, optional): 차단 후 시험 요청을 허용하기까지의 시간 (초)
+        """
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_RESET_TIMEOUT
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        요청 허용 여부 확인 (열린 상태에서 reset_timeout이 지나면 시험 요청 1개만 허용)
+
+        Returns:
+            bool: 허용 여부
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_progress = False
+
+            if self.state == self.HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+
+            return False
+
+    def record_success(self):
+        """성공 기록 (시험 요청이 성공하면 차단기를 닫음)"""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        """실패 기록 (연속 실패가 임계값에 도달하거나 시험 요청이 실패하면 차단기를 엶)"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.open_count += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_progress = False
+
+    def release_trial(self):
+        """시험 요청이 업스트림에 보내지지 못하고 거절된 경우 다음 요청이 다시 시험할 수 있도록 되돌림"""
+        with self._lock:
+            self._trial_in_progress = False
+
+    def stats(self):
+        """회로 차단기 상태 반환"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'open_count': self.open_count
+            }
+
+
+class Bulkhead:
+    """업스트림별 동시 요청 수와 대기열 길이를 제한하고 회로 차단기를 적용하는 격벽(bulkhead)"""
+
+    def __init__(self, name, max_concurrency, max_queue, queue_timeout=None, circuit_breaker=None):
+        """
+        격벽 초기화
+
+        Args:
+            name (str): 업스트림 이름 (예: 'claude')
+            max_concurrency (int): 최대 동시 요청 수
+            max_queue (int): 빈 자리를 기다릴 수 있는 최대 요청 수 (초과 시 즉시 거절)
+            queue_timeout (float, optional): 대기열에서 기다릴 최대 시간 (초)
+            circuit_breaker (CircuitBreaker, optional): 회로 차단기
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout if queue_timeout is not None else Config.UPSTREAM_ACQUIRE_TIMEOUT
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected_full = 0
+        self.rejected_open = 0
+
+    def call(self, ignore_errors=()):
+        """
+        업스트림 호출 하나를 감싸는 컨텍스트 매니저 생성
+
+        사용 예:
+            with bulkhead.call() as call:
+                response = session.post(...)
+                if response.status_code >= 500:
+                    call.fail()
+
+        Args:
+            ignore_errors (tuple, optional): 업스트림 실패로 보지 않을 예외 타입 (예: 인식 결과 없음)
+
+        Returns:
+            BulkheadCall: 호출 컨텍스트
+        """
+        return BulkheadCall(self, ignore_errors)
+
+    def _acquire(self):
+        """요청 자리 확보 (차단기가 열려 있거나 대기열이 가득 차면 즉시 거절)"""
+        if not self.circuit_breaker.allow_request():
+            with self._lock:
+                self.rejected_open += 1
+            raise CircuitOpenError(f"{self.name} 회로 차단기가 열려 있습니다.")
+
+        # 바로 자리가 있으면 대기 없이 진행
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                if self.queued >= self.max_queue:
+                    self.rejected_full += 1
+                    full = True
+                else:
+                    self.queued += 1
+                    full = False
+            if full:
+                self.circuit_breaker.release_trial()
+                raise BulkheadFullError(f"{self.name} 동시 요청 한도({self.max_concurrency})와 대기열이 가득 찼습니다.")
+
+            try:
+                acquired = self._semaphore.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.queued -= 1
+
+            if not acquired:
+                with self._lock:
+                    self.rejected_full += 1
+                self.circuit_breaker.release_trial()
+                raise BulkheadFullError(f"{self.name} 대기 시간({self.queue_timeout}초)을 초과했습니다.")
+
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _release(self, failed):
+        """요청 자리 반환 및 결과를 회로 차단기에 기록"""
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+        self._semaphore.release()
+
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def stats(self):
+        """격벽 및 회로 차단기 현황 반환"""
+        with self._lock:
+            stats = {
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'queued': self.queued,
+                'peak_in_flight': self.peak_in_flight,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected_full': self.rejected_full,
+                'rejected_open': self.rejected_open
+            }
+        stats['circuit'] = self.circuit_breaker.stats()
+        return stats
+
+
+class BulkheadCall:
+    """격벽을 통과하는 업스트림 호출 하나 (컨텍스트 매니저 또는 start()/finish()로 사용)"""
+
+    def __init__(self, bulkhead, ignore_errors=()):
+        self.bulkhead = bulkhead
+        self.ignore_errors = tuple(ignore_errors)
+        self.failed = False
+        self._started = False
+        self._finished = False
+        self._started_at = None
+        self._span = None
+
+    def start(self):
+        """
+        요청 자리 확보
+
+        Raises:
+            BulkheadFullError: 동시 요청과 대기열이 가득 찬 경우
+            CircuitOpenError: 회로 차단기가 열려 있는 경우
+        """
+        # 대기열에서 기다린 시간도 업스트림 구간에 포함 (queue_ms로 구분)
+        self._span = tracing.start_span(f"upstream.{self.bulkhead.name}")
+        requested_at = time.perf_counter()
+        try:
+            self.bulkhead._acquire()
+        except Exception as e:
+            if self._span is not None:
+                self._span.end(error=e)
+            raise
+        self._started = True
+        self._started_at = time.perf_counter()
+        if self._span is not None:
+            self._span.set_attribute('queue_ms', round((self._started_at - requested_at) * 1000, 1))
+        return self
+
+    def fail(self):
+        """예외 없이 실패한 호출(예: 5xx 응답)로 표시"""
+        self.failed = True
+
+    def finish(self):
+        """요청 자리 반환 (여러 번 호출해도 한 번만 반영)"""
+        if self._started and not self._finished:
+            self._finished = True
+            self.bulkhead._release(self.failed)
+            upstream_request_duration.observe(
+                time.perf_counter() - self._started_at,
+                upstream=self.bulkhead.name,
+                outcome='error' if self.failed else 'ok'
+            )
+            if self._span is not None:
+                self._span.end(error='upstream call failed' if self.failed else None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 클라이언트 연결 종료(GeneratorExit 등)는 업스트림 실패로 보지 않음
+        if (exc_type is not None and issubclass(exc_type, Exception)
+                and not issubclass(exc_type, self.ignore_errors)):
+            self.failed = True
+        self.finish()
+        return False
+
+
+class ReleasingIterator:
+    """이터레이터가 끝나거나 닫힐 때 한 번만 release 함수를 호출하는 래퍼 (스트리밍 응답용)"""
+
+    def __init__(self, iterable, release):
+        """
+        Args:
+            iterable: 감쌀 이터레이터
+            release (callable): 종료 시 호출할 함수 (예: BulkheadCall.finish)
+        """
+        self._iterator = iter(iterable)
+        self._release = release
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """이터레이터를 닫고 자원 반환 (WSGI 서버가 응답 종료 시 호출)"""
+        if self._released:
+            return
+        self._released = True
+        try:
+            close = getattr(self._iterator, 'close', None)
+            if close:
+                close()
+        finally:
+            self._release()
+
+
+# 업스트림 이름 -> (최대 동시 요청 수, 최대 대기열 길이) 설정
+_UPSTREAM_LIMITS = {
+    'claude': lambda: (Config.CLAUDE_MAX_CONCURRENCY, Config.CLAUDE_MAX_QUEUE),
+    'fish_tts': lambda: (Config.FISH_TTS_MAX_CONCURRENCY, Config.FISH_TTS_MAX_QUEUE),
+    'google_stt': lambda: (Config.STT_MAX_CONCURRENCY, Config.STT_MAX_QUEUE)
+}
+
+_bulkheads = {}
+_bulkheads_lock = threading.Lock()
+
+def get_bulkhead(name):
+    """
+    업스트림별로 공유되는 격벽 반환
+
+    Args:
+        name (str): 업스트림 이름 ('claude', 'fish_tts', 'google_stt')
+
+    Returns:
+        Bulkhead: 공유 격벽
+    """
+    bulkhead = _bulkheads.get(name)
+    if bulkhead is None:
+        with _bulkheads_lock:
+            bulkhead = _bulkheads.get(name)
+            if bulkhead is None:
+                max_concurrency, max_queue = _UPSTREAM_LIMITS[name]()
+                bulkhead = Bulkhead(name, max_concurrency, max_queue)
+                _bulkheads[name] = bulkhead
+    return bulkhead
+
+def get_bulkhead_stats():
+    """모든 업스트림 격벽의 현황 반환"""
+    return {name: bulkhead.stats() for name, bulkhead in list(_bulkheads.items())}
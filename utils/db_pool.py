@@ -0,0 +1,85 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+class InstrumentedQueuePool(QueuePool):
+    """연결 대여(checkout) 대기 시간과 포화 상태를 집계하는 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.peak_checked_out = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        """풀에서 연결을 꺼내는 데 걸린 시간 측정 (새 연결 생성 시간 포함)"""
+        with self._stats_lock:
+            self.waiting += 1
+
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self.waiting -= 1
+
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+        return record
+
+    def stats(self):
+        """연결 풀 사용 현황 반환"""
+        capacity = self.size() + max(self._max_overflow, 0)
+        checked_out = self.checkedout()
+        with self._stats_lock:
+            return {
+                'pool_size': self.size(),
+                'max_overflow': self._max_overflow,
+                'checked_out': checked_out,
+                'idle': self.checkedin(),
+                'overflow': max(self.overflow(), 0),
+                'waiting': self.waiting,
+                'saturation': checked_out / capacity if capacity else 0.0,
+                'peak_checked_out': self.peak_checked_out,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avg_checkout_ms': self.total_wait_seconds * 1000 / self.checkouts if self.checkouts else 0.0,
+                'max_checkout_ms': self.max_wait_seconds * 1000
+            }
+
+
+def warm_up_pool(engine, count):
+    """
+    연결 풀에 연결을 미리 열어둠 (첫 요청들이 동시에 연결을 만드는 상황 방지)
+
+    Args:
+        engine: SQLAlchemy 엔진
+        count (int): 미리 열 연결 수
+
+    Returns:
+        int: 실제로 연 연결 수
+    """
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    except Exception as e:
+        print(f"DB 연결 풀 예열 오류: {str(e)}")
+    finally:
+        # 모두 동시에 연 뒤 반환해야 서로 다른 연결이 풀에 남음
+        for connection in connections:
+            connection.close()
+    return len(connections)
@@ -0,0 +1,134 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+# 재시도 대상 HTTP 상태 코드 (요청 한도 초과, 일시적 서버 오류)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class PooledSession(requests.Session):
+    """연결 풀, 기본 타임아웃, 재시도, 사용량 통계를 갖춘 HTTP 세션"""
+
+    def __init__(self, name, pool_maxsize=None, retry_methods=('GET', 'HEAD', 'POST')):
+        """
+        세션 초기화
+
+        Args:
+            name (str): 세션 이름 (통계 구분용)
+            pool_maxsize (int, optional): 호스트별 최대 연결 수
+            retry_methods (tuple): 재시도를 허용할 HTTP 메서드
+        """
+        super().__init__()
+        self.name = name
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_MAXSIZE
+        self.timeout = (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
+
+        # 연결 실패와 429/5xx 응답에 대해 지수 백오프로 재시도
+        # (응답 수신 중 끊긴 요청은 중복 처리를 막기 위해 재시도하지 않음)
+        retry = Retry(
+            total=Config.HTTP_MAX_RETRIES,
+            connect=Config.HTTP_MAX_RETRIES,
+            read=0,
+            status=Config.HTTP_MAX_RETRIES,
+            backoff_factor=Config.HTTP_RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(retry_methods),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+        self.adapter = HTTPAdapter(
+            pool_connections=Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry
+        )
+        self.mount('https://', self.adapter)
+        self.mount('http://', self.adapter)
+        self.headers['Connection'] = 'keep-alive'
+
+        # 사용량 통계
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.saturated_requests = 0  # 풀 크기를 넘어 새 연결이 필요했던 요청 수
+        self.failed_requests = 0
+
+    def request(self, method, url, **kwargs):
+        """기본 타임아웃을 적용하고 동시 요청 수를 기록하며 요청 수행"""
+        kwargs.setdefault('timeout', self.timeout)
+
+        with self._lock:
+            self.in_flight += 1
+            self.total_requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.in_flight > self.pool_maxsize:
+                self.saturated_requests += 1
+
+        try:
+            return super().request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self.failed_requests += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self):
+        """세션 및 호스트별 연결 풀 사용 현황 반환"""
+        hosts = {}
+        # urllib3 공개 인터페이스(keys/get)만 사용 (조회 사이에 제거된 풀은 건너뜀)
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            # pool.pool 큐에 남아 있는 항목 수 = 바로 사용할 수 있는 연결 슬롯 수
+            idle_slots = pool.pool.qsize() if pool.pool is not None else 0
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                'maxsize': self.pool_maxsize,
+                'in_use': self.pool_maxsize - idle_slots,
+                'connections_opened': pool.num_connections,
+                'requests': pool.num_requests
+            }
+
+        with self._lock:
+            return {
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'pool_maxsize': self.pool_maxsize,
+                'total_requests': self.total_requests,
+                'saturated_requests': self.saturated_requests,
+                'failed_requests': self.failed_requests,
+                'hosts': hosts
+            }
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(name, **kwargs):
+    """
+    이름별로 공유되는 HTTP 세션 반환 (없으면 생성)
+
+    Args:
+        name (str): 세션 이름 (예: 'fish_tts')
+        **kwargs: 처음 생성할 때 PooledSession에 전달할 옵션
+
+    Returns:
+        PooledSession: 공유 세션
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = PooledSession(name, **kwargs)
+                _sessions[name] = session
+    return session
+
+def get_pool_stats():
+    """모든 공유 세션의 연결 풀 통계 반환"""
+    return {name: session.stats() for name, session in list(_sessions.items())}
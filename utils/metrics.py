@@ -0,0 +1,261 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# 기본 지연 시간 구간 (초) - 빠른 DB 요청부터 긴 TTS/Claude 스트리밍까지
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _format_value(value):
+    """Prometheus 텍스트 형식의 숫자 표현"""
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+def _escape_label(value):
+    """레이블 값의 역슬래시/따옴표/줄바꿈 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    """{이름="값",...} 형식의 레이블 문자열"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels) + '}'
+
+
+class _Metric:
+    """레이블 값 조합별로 값을 보관하는 메트릭 공통 부분"""
+
+    type_name = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # 레이블 값 튜플 -> 값
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} 레이블은 {self.labelnames} 입니다.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """
+        현재 값 목록
+
+        Returns:
+            list: (접미사, 레이블 [(이름, 값)], 값) 튜플 리스트
+        """
+        with self._lock:
+            return [('', list(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """증가만 하는 누적 값 (요청 수, 바이트 수 등)"""
+
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 (활성 세션 수 등)"""
+
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """지연 시간 분포 (구간별 개수, 합계, 횟수)"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # 구간별 개수는 누적하지 않고 저장하고 출력할 때 누적 (기록 비용 최소화)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+
+        samples = []
+        for key, counts, total, count in snapshot:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append(('_bucket', labels + [('le', _format_value(float(bound)))], cumulative))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """메트릭과 수집 함수를 모아 Prometheus 텍스트 형식으로 출력하는 클래스"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector):
+        """
+        출력할 때마다 호출되는 수집 함수 등록 (요청 처리 경로에 비용이 없는 현황 값용)
+
+        Args:
+            collector (callable): (이름, 형식, 설명, [(레이블 dict, 값)]) 튜플 리스트를 반환하는 함수
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """
+        모든 메트릭을 Prometheus 텍스트 형식으로 출력
+
+        Returns:
+            str: 텍스트 형식 메트릭
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"메트릭 수집 오류: {str(e)}")
+                continue
+            for name, type_name, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+# 프로세스 전체에서 공유하는 메트릭 (gunicorn 워커가 여러 개면 워커별로 집계됨)
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'http_requests_total', 'HTTP 요청 수', ('method', 'route', 'status'))
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds', 'HTTP 요청 처리 시간 (스트리밍 응답은 첫 응답까지)', ('method', 'route'))
+http_request_bytes = registry.counter(
+    'http_request_bytes_total', 'HTTP 요청 본문 크기 합계', ('route',))
+http_response_bytes = registry.counter(
+    'http_response_bytes_total', 'HTTP 응답 본문 크기 합계 (길이를 알 수 있는 응답만)', ('route',))
+
+upstream_request_duration = registry.histogram(
+    'upstream_request_duration_seconds', '업스트림 호출 시간 (자리 확보 후 완료까지, 스트리밍은 전체 전송 시간)',
+    ('upstream', 'outcome'))
+
+transcode_duration = registry.histogram(
+    'transcode_duration_seconds', 'ffmpeg 변환 작업 시간', ('operation', 'phase'))
+
+socketio_sessions = registry.gauge(
+    'socketio_sessions_active', '연결된 Socket.IO 세션 수')
+socketio_sessions.set(0)
+socketio_events = registry.counter(
+    'socketio_events_total', 'Socket.IO 이벤트 수', ('event',))
+socketio_event_duration = registry.histogram(
+    'socketio_event_duration_seconds', 'Socket.IO 이벤트 처리 시간', ('event',))
+socketio_received_bytes = registry.counter(
+    'socketio_received_bytes_total', 'Socket.IO로 받은 오디오 데이터 크기 합계', ('event',))
+
+
+def init_app(app):
+    """
+    Flask 앱에 라우트별 요청 수/처리 시간/전송량 측정 등록
+
+    Args:
+        app: Flask 애플리케이션 인스턴스
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return response
+
+        # 경로 변수 대신 라우트 규칙을 레이블로 사용 (레이블 종류 수 제한)
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        http_request_duration.observe(time.perf_counter() - started, method=request.method, route=route)
+        http_requests.inc(method=request.method, route=route, status=response.status_code)
+        if request.content_length:
+            http_request_bytes.inc(request.content_length, route=route)
+        if response.content_length:
+            http_response_bytes.inc(response.content_length, route=route)
+        return response
@@ -0,0 +1,136 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from config import Config
+
+class PasswordHasherBusyError(Exception):
+    """비밀번호 해시 작업 대기열이 가득 차서 작업을 받을 수 없을 때 발생"""
+
+
+class PasswordHasher:
+    """비밀번호 해시 생성/검증을 요청 스레드 밖의 제한된 작업 풀에서 실행하는 클래스"""
+
+    def __init__(self, iterations=None, max_workers=None, max_queue=None, timeout=None):
+        """
+        해시 도구 초기화
+
+        Args:
+            iterations (int, optional): PBKDF2 반복 횟수 (작업 비용)
+            max_workers (int, optional): 동시에 해시를 계산할 스레드 수
+            max_queue (int, optional): 실행 대기 가능한 최대 작업 수 (초과 시 거절)
+            timeout (float, optional): 작업 하나의 최대 대기 시간 (초)
+        """
+        self.iterations = iterations or Config.PASSWORD_HASH_ITERATIONS
+        self.method = f"pbkdf2:sha256:{self.iterations}"
+        self.max_workers = max_workers or Config.PASSWORD_HASH_WORKERS
+        self.max_queue = max_queue if max_queue is not None else Config.PASSWORD_HASH_MAX_QUEUE
+        self.timeout = timeout or Config.PASSWORD_HASH_TIMEOUT
+
+        # 실행 중 + 대기 중인 작업 수 제한 (백프레셔)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._workers = threading.BoundedSemaphore(self.max_workers)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def hash(self, password):
+        """
+        비밀번호 해시 생성
+
+        Args:
+            password (str): 비밀번호
+
+        Returns:
+            str: 'pbkdf2:sha256:<반복 횟수>$<salt>$<hash>' 형식의 해시
+        """
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """
+        비밀번호 검증
+
+        Args:
+            password_hash (str): 저장된 해시
+            password (str): 입력된 비밀번호
+
+        Returns:
+            bool: 일치 여부
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """
+        저장된 해시가 현재 설정(알고리즘/반복 횟수)과 다른지 확인
+
+        Args:
+            password_hash (str): 저장된 해시
+
+        Returns:
+            bool: 다시 해시해야 하면 True
+        """
+        method = password_hash.split('$', 1)[0]
+        return method != self.method
+
+    def _run(self, func, *args):
+        """해시 작업을 작업 풀에서 실행하고 결과를 기다림 (대기열이 가득 차면 즉시 거절)"""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusyError("비밀번호 처리 대기열이 가득 찼습니다.")
+
+        if Config.ASYNC_MODE in ('eventlet', 'gevent'):
+            # 그린 스레드 환경에서는 실제 OS 스레드에서 계산해야 이벤트 루프가 멈추지 않음
+            try:
+                if not self._workers.acquire(timeout=self.timeout):
+                    raise PasswordHasherBusyError("비밀번호 처리 대기 시간을 초과했습니다.")
+                try:
+                    return self._run_native(func, *args)
+                finally:
+                    self._workers.release()
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # 자리는 작업이 실제로 끝났을 때 반환 (대기 시간 초과 후에도 계산 중인 작업은 자리를 유지)
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusyError("비밀번호 처리 대기 시간을 초과했습니다.")
+
+    @staticmethod
+    def _run_native(func, *args):
+        """비동기 워커의 네이티브 스레드 풀에서 실행"""
+        if Config.ASYNC_MODE == 'eventlet':
+            from eventlet import tpool
+            return tpool.execute(func, *args)
+
+        import gevent
+        return gevent.get_hub().threadpool.apply(func, args)
+
+    def _get_executor(self):
+        """해시 작업용 스레드 풀 반환 (첫 사용 시 생성)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='password-hash'
+                    )
+        return self._executor
+
+
+_shared_hasher = None
+_shared_hasher_lock = threading.Lock()
+
+def get_password_hasher():
+    """프로세스 전체에서 공유하는 비밀번호 해시 도구 반환"""
+    global _shared_hasher
+    if _shared_hasher is None:
+        with _shared_hasher_lock:
+            if _shared_hasher is None:
+                _shared_hasher = PasswordHasher()
+    return _shared_hasher
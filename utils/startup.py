@@ -0,0 +1,107 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """서버 시작 단계와 서비스 초기화에 걸린 시간을 기록하는 클래스"""
+
+    def __init__(self):
+        self._phases = []  # (이름, 소요 시간(초)) 시작 순서대로
+        self._services = []  # (이름, 소요 시간(초)) 첫 사용 순서대로
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, name):
+        """
+        블록 실행 시간을 시작 단계로 기록
+
+        사용 예:
+            with startup_profiler.timed('init_db'):
+                init_db(app, Config)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        """시작 단계 소요 시간 기록"""
+        with self._lock:
+            self._phases.append((name, seconds))
+
+    def record_service(self, name, seconds):
+        """서비스 초기화(첫 사용) 소요 시간 기록"""
+        with self._lock:
+            self._services.append((name, seconds))
+
+    def report(self):
+        """
+        기록된 시간 반환
+
+        Returns:
+            dict: 단계별/서비스별 소요 시간 (밀리초)
+        """
+        with self._lock:
+            return {
+                'phases_ms': {name: round(seconds * 1000, 1) for name, seconds in self._phases},
+                'services_ms': {name: round(seconds * 1000, 1) for name, seconds in self._services},
+                'total_ms': round(sum(seconds for _, seconds in self._phases) * 1000, 1)
+            }
+
+    def print_report(self, title="서버 시작 시간"):
+        """기록된 시간을 표준 출력으로 출력"""
+        report = self.report()
+        print(f"{title}: 총 {report['total_ms']}ms")
+        for name, ms in report['phases_ms'].items():
+            print(f"  - {name}: {ms}ms")
+        for name, ms in report['services_ms'].items():
+            print(f"  - (서비스) {name}: {ms}ms")
+
+
+startup_profiler = StartupProfiler()
+
+
+class lazy_service:
+    """
+    첫 사용 시 서비스를 생성하는 속성 (생성 시간은 startup_profiler에 기록)
+
+    사용 예:
+        class ChatController:
+            claude_service = lazy_service(_create_claude_service)
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory (callable): 속성을 가진 객체를 받아 서비스 객체를 생성하는 함수
+                                (무거운 모듈은 함수 안에서 import)
+        """
+        self.factory = factory
+        self.name = None
+        self.label = None
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.label = f"{owner.__name__}.{name}"
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        # 생성된 서비스는 인스턴스 __dict__에 저장되어 이후에는 이 메서드를 거치지 않음
+        with self._lock:
+            if self.name in instance.__dict__:
+                return instance.__dict__[self.name]
+
+            started = time.perf_counter()
+            service = self.factory(instance)
+            startup_profiler.record_service(self.label, time.perf_counter() - started)
+            instance.__dict__[self.name] = service
+            return service
+
+
+def is_loaded(instance, name):
+    """lazy_service 속성이 이미 생성되었는지 확인 (메트릭 조회 등에서 불필요한 생성 방지)"""
+    return name in instance.__dict__
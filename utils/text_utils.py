@@ -0,0 +1,100 @@
+import re
+
+# 문장 종결 부호 (한국어/영어/전각 문자) 뒤에 닫는 따옴표·괄호가 올 수 있음
+# 중국어/일본어 전각 종결 부호(。！？｡)는 띄어쓰기 없이 다음 문장이 이어지므로 공백이 없어도 분리
+_SENTENCE_END = re.compile(
+    r'[.!?…]*[。！？｡][.!?…。！？｡]*["\'”’」』)\]）】]*'
+    r'|[.!?…]+["\'”’」』)\]）】]*(?=\s|$)'
+    r'|\n+'
+)
+
+# 긴 문장을 나눌 때 사용할 보조 구분자
+_SOFT_BREAK = re.compile(r'[,，、;:]\s|\s')
+
+def split_sentences(text, max_chars=200, min_chars=10):
+    """
+    텍스트를 TTS 변환 단위의 문장으로 분리
+
+    Args:
+        text (str): 분리할 텍스트
+        max_chars (int): 문장 하나의 최대 길이 (초과 시 쉼표/공백 기준으로 분할)
+        min_chars (int): 이보다 짧은 조각은 다음 문장과 합침
+
+    Returns:
+        list: 문장 리스트
+    """
+    if not text:
+        return []
+
+    # 1. 종결 부호 기준으로 분리
+    pieces = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        piece = text[start:match.end()].strip()
+        if piece:
+            pieces.append(piece)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        pieces.append(tail)
+
+    # 2. 너무 짧은 조각은 다음 조각과 합침 ("네." 같은 짧은 대답이 따로 합성되지 않도록)
+    merged = []
+    carry = ''
+    for piece in pieces:
+        piece = f"{carry} {piece}" if carry else piece
+        if len(piece) < min_chars:
+            carry = piece
+            continue
+        merged.append(piece)
+        carry = ''
+    if carry:
+        if merged:
+            merged[-1] = f"{merged[-1]} {carry}"
+        else:
+            merged.append(carry)
+
+    # 3. 너무 긴 문장은 쉼표나 공백 기준으로 분할
+    sentences = []
+    for sentence in merged:
+        sentences.extend(_split_long(sentence, max_chars))
+    return sentences
+
+def pop_complete_sentences(buffer, min_chars=10):
+    """
+    스트리밍 중인 텍스트 버퍼에서 완성된 문장만 꺼냄
+
+    Args:
+        buffer (str): 지금까지 수신한 텍스트
+        min_chars (int): 꺼낼 문장의 최소 길이
+
+    Returns:
+        tuple: (완성된 문장 리스트, 아직 완성되지 않은 나머지 텍스트)
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(buffer):
+        # 버퍼 끝의 종결 부호는 뒤에 내용이 더 올 수 있으므로 보류 ("3." 다음 "14" 등)
+        if match.end() == len(buffer) and not match.group().startswith('\n'):
+            break
+        piece = buffer[start:match.end()].strip()
+        if len(piece) < min_chars:
+            continue
+        sentences.append(piece)
+        start = match.end()
+    return sentences, buffer[start:]
+
+def _split_long(sentence, max_chars):
+    """최대 길이를 넘는 문장을 자연스러운 위치에서 분할"""
+    parts = []
+    while len(sentence) > max_chars:
+        cut = -1
+        for match in _SOFT_BREAK.finditer(sentence, 0, max_chars):
+            cut = match.end()
+        if cut <= 0:
+            cut = max_chars
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
@@ -0,0 +1,343 @@
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from config import Config
+
+# 현재 실행 중인 span (요청 스레드/그린 스레드별로 분리되고, wrap()으로 작업 풀에 전달)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+_TRACEPARENT = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+_TRACE_ID = re.compile(r'^[0-9a-f]{16}([0-9a-f]{16})?$')
+
+def _new_id(bits=64):
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """추적 구간 하나 (이름, 시작 시각, 소요 시간, 속성)"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'timestamp', '_started', 'duration', 'error')
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.timestamp = time.time()
+        self._started = time.perf_counter()
+        self.duration = None
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self, error=None):
+        """구간 종료 및 기록 (여러 번 호출해도 한 번만 기록)"""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+        _exporter.export(self)
+
+    def to_dict(self):
+        """Zipkin v2 JSON 형식으로 변환 (수집기로 그대로 전송 가능)"""
+        tags = {key: str(value) for key, value in self.attributes.items()}
+        if self.error is not None:
+            tags['error'] = self.error
+        record = {
+            'traceId': self.trace_id,
+            'id': self.span_id,
+            'name': self.name,
+            'timestamp': int(self.timestamp * 1_000_000),
+            'duration': max(int(self.duration * 1_000_000), 1),
+            'localEndpoint': {'serviceName': Config.TRACE_SERVICE_NAME},
+            'tags': tags
+        }
+        if self.parent_id:
+            record['parentId'] = self.parent_id
+        return record
+
+
+class _JsonLinesExporter:
+    """종료된 span을 백그라운드 스레드에서 JSON Lines 파일에 기록 (요청 스레드는 대기열에 넣기만 함)"""
+
+    def __init__(self):
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+
+    def export(self, span):
+        try:
+            self._get_queue().put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _get_queue(self):
+        # fork 후에는 부모 프로세스의 기록 스레드가 없으므로 프로세스마다 새로 시작
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=Config.TRACE_EXPORT_QUEUE)
+                    threading.Thread(target=self._run, args=(self._queue,), daemon=True,
+                                     name='trace-exporter').start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def _run(self, spans):
+        path = Config.TRACE_EXPORT_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        while True:
+            batch = [spans.get()]
+            # 쌓여 있는 span은 한 번에 기록
+            while len(batch) < 500:
+                try:
+                    batch.append(spans.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(path, 'a', encoding='utf-8') as f:
+                    for span in batch:
+                        f.write(json.dumps(span.to_dict(), ensure_ascii=False) + '\n')
+                self.exported += len(batch)
+            except Exception as e:
+                print(f"추적 기록 오류: {str(e)}")
+                self.dropped += len(batch)
+
+    def stats(self):
+        return {'exported': self.exported, 'dropped': self.dropped}
+
+
+_exporter = _JsonLinesExporter()
+
+def get_exporter_stats():
+    """span 기록 현황 반환"""
+    return _exporter.stats()
+
+def current_span():
+    """현재 span 반환 (추적 중이 아니면 None)"""
+    return _current_span.get()
+
+def start_trace(name, trace_id=None, parent_id=None, sampled=None, **attributes):
+    """
+    새 추적의 최상위 span 시작 (표본 추출에서 제외되면 None)
+
+    Args:
+        name (str): span 이름
+        trace_id (str, optional): 상위 시스템에서 전달받은 추적 ID
+        parent_id (str, optional): 상위 시스템의 span ID
+        sampled (bool, optional): 상위 시스템의 표본 추출 결정 (None이면 TRACE_SAMPLE_RATE로 결정)
+
+    Returns:
+        Span: 시작된 span 또는 None
+    """
+    if not Config.TRACING_ENABLED or sampled is False:
+        return None
+    if sampled is None and random.random() >= Config.TRACE_SAMPLE_RATE:
+        return None
+    return Span(name, trace_id or _new_id(128), parent_id, attributes)
+
+def start_span(name, parent=None, **attributes):
+    """
+    하위 span 시작 (현재 span으로 설정하지 않음, 호출한 쪽에서 end() 호출)
+
+    Args:
+        name (str): span 이름
+        parent (Span, optional): 상위 span (없으면 현재 span)
+
+    Returns:
+        Span: 시작된 span, 추적 중이 아니면 None
+    """
+    parent = parent or _current_span.get()
+    if parent is None:
+        return None
+    return Span(name, parent.trace_id, parent.span_id, attributes)
+
+@contextmanager
+def span(name, **attributes):
+    """
+    블록을 현재 span의 하위 span으로 기록 (추적 중이 아니면 아무것도 하지 않음)
+
+    사용 예:
+        with tracing.span('claude.build_request'):
+            ...
+    """
+    child = start_span(name, **attributes)
+    if child is None:
+        yield None
+        return
+
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+@contextmanager
+def trace(name, **attributes):
+    """
+    블록을 새 추적의 최상위 span으로 기록 (Flask 요청 밖의 Socket.IO 이벤트 등)
+
+    사용 예:
+        with tracing.trace('socketio.stream_audio'):
+            ...
+    """
+    root = start_trace(name, **attributes)
+    if root is None:
+        yield None
+        return
+
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        root.end()
+
+def traced(name):
+    """함수 실행을 span으로 기록하는 데코레이터 (제너레이터 함수에는 사용하지 않음)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def wrap(func):
+    """
+    현재 추적 컨텍스트에서 실행되도록 함수를 감쌈 (작업 풀에 제출하기 전에 사용)
+
+    Args:
+        func (callable): 작업 풀에서 실행할 함수
+
+    Returns:
+        callable: 감싼 함수 (추적 중이 아니면 원래 함수)
+    """
+    if _current_span.get() is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def _parse_parent(headers):
+    """
+    요청 헤더에서 상위 추적 정보 추출 (W3C traceparent 또는 X-Trace-Id)
+
+    traceparent의 sampled 플래그가 켜져 있을 때만 표본 추출을 건너뛰고,
+    꺼져 있으면 기록하지 않음. X-Trace-Id는 추적 ID만 이어받고 TRACE_SAMPLE_RATE를 따름
+
+    Returns:
+        tuple: (추적 ID, 상위 span ID, 표본 추출 여부) - 없는 값은 None
+    """
+    match = _TRACEPARENT.match(headers.get('traceparent', '').strip().lower())
+    if match:
+        return match.group(1), match.group(2), bool(int(match.group(3), 16) & 0x01)
+
+    trace_id = headers.get('X-Trace-Id', '').strip().lower()
+    if _TRACE_ID.match(trace_id):
+        return trace_id, None, None
+    return None, None, None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    query_span = start_span('db.query', statement=' '.join(statement.split())[:200])
+    if query_span is not None:
+        conn.info.setdefault('trace_spans', []).append(query_span)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get('trace_spans')
+    if spans:
+        query_span = spans.pop()
+        query_span.set_attribute('rows', cursor.rowcount)
+        query_span.end()
+
+def _handle_db_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get('trace_spans') if connection is not None else None
+    if spans:
+        spans.pop().end(error=exception_context.original_exception)
+
+def init_app(app):
+    """
+    Flask 요청과 SQLAlchemy 쿼리 추적 등록 (TRACING_ENABLED일 때만)
+
+    요청마다 최상위 span 아래에 http.handler(컨트롤러/서비스 처리)와
+    http.response(응답 본문 전송, 스트리밍/send_file 포함) span을 기록하고
+    응답 헤더 X-Trace-Id로 추적 ID를 돌려줌
+
+    Args:
+        app: Flask 애플리케이션 인스턴스
+    """
+    if not Config.TRACING_ENABLED:
+        return
+
+    from flask import g, request
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    class TracedRequest(app.request_class):
+        def get_json(self, *args, **kwargs):
+            with span('http.parse_json'):
+                return super().get_json(*args, **kwargs)
+
+    app.request_class = TracedRequest
+
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(Engine, 'handle_error', _handle_db_error)
+
+    @app.before_request
+    def _start_request_trace():
+        trace_id, parent_id, sampled = _parse_parent(request.headers)
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        root = start_trace(f"{request.method} {route}", trace_id, parent_id, sampled,
+                           method=request.method, path=request.path)
+        if root is None:
+            _current_span.set(None)
+            return
+
+        handler = start_span('http.handler', parent=root, endpoint=request.endpoint)
+        _current_span.set(handler)
+        g._trace_spans = (root, handler)
+
+    @app.after_request
+    def _end_request_trace(response):
+        spans = g.pop('_trace_spans', None)
+        if spans is None:
+            return response
+
+        root, handler = spans
+        handler.end()
+        root.set_attribute('status', response.status_code)
+        response.headers['X-Trace-Id'] = root.trace_id
+
+        # 응답 본문 전송(스트리밍 제너레이터 실행 포함)은 응답이 닫힐 때까지 기록
+        sending = start_span('http.response', parent=root)
+        _current_span.set(sending)
+
+        def finish():
+            sending.end()
+            root.end()
+            _current_span.set(None)
+
+        response.call_on_close(finish)
+        return response